@@ -0,0 +1,51 @@
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework.renderers import JSONRenderer
+
+from user_auth_app.authentication import CachedTokenAuthentication
+
+
+def json_response(data, status=200):
+    """Render ``data`` like the DRF views do."""
+    renderer = JSONRenderer()
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+
+class AsyncAPIView(View):
+    """Base of native async read views for ASGI.
+
+    DRF views are synchronous, so under ASGI each request runs in a worker
+    thread. These views are plain async Django views instead: the token is
+    resolved with :meth:`CachedTokenAuthentication.aauthenticate` and
+    ``check_permissions`` is awaited before the handler, so a request only
+    holds a thread while one of its queries runs. DRF ``APIException``s are
+    answered with the same JSON bodies and status codes as in DRF views.
+    """
+
+    authentication_class = CachedTokenAuthentication
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.authenticate(request)
+            await self.check_permissions(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request):
+        result = await self.authentication_class().aauthenticate(request)
+        request.user, request.auth = result if result is not None else (AnonymousUser(), None)
+
+    async def check_permissions(self, request):
+        """Require an authenticated user; subclasses add their own checks."""
+        if not request.user.is_authenticated:
+            raise NotAuthenticated()
+
+    def handle_exception(self, exc):
+        detail = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+        response = json_response(detail, status=exc.status_code)
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            response['WWW-Authenticate'] = self.authentication_class.keyword
+        return response
@@ -0,0 +1,225 @@
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+_current = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """Time and query totals of the request being served."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextmanager
+def timed(part):
+    """Add the time spent in the block to ``part`` of the current request timing."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(timing, part, getattr(timing, part) + time.perf_counter() - start)
+
+
+class Histogram:
+    """Cumulative Prometheus histogram for one label set."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Aggregated request metrics of this process."""
+
+    histograms = {
+        'http_request_duration_seconds': ('Total time spent serving the request.', DURATION_BUCKETS),
+        'http_request_db_duration_seconds': ('Time spent executing database queries.', DURATION_BUCKETS),
+        'http_request_serializer_duration_seconds': ('Time spent serializing response data.', DURATION_BUCKETS),
+        'http_request_db_queries': ('Database queries executed per request.', QUERY_BUCKETS),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = {}
+        self.requests = {}
+
+    def record(self, route, method, status, total, timing):
+        labels = (route, method)
+        values = {
+            'http_request_duration_seconds': total,
+            'http_request_db_duration_seconds': timing.db,
+            'http_request_serializer_duration_seconds': timing.serializer,
+            'http_request_db_queries': timing.queries,
+        }
+        with self.lock:
+            for name, value in values.items():
+                key = (name, labels)
+                if key not in self.series:
+                    self.series[key] = Histogram(self.histograms[name][1])
+                self.series[key].observe(value)
+            key = (route, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def clear(self):
+        with self.lock:
+            self.series.clear()
+            self.requests.clear()
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = ['# HELP http_requests_total Requests served.', '# TYPE http_requests_total counter']
+        with self.lock:
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+            for name, (help_text, _) in self.histograms.items():
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for (series_name, (route, method)), histogram in sorted(self.series.items()):
+                    if series_name != name:
+                        continue
+                    labels = f'route="{route}",method="{method}"'
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class TimedSerializerMixin:
+    """Count the time spent building ``data`` as serializer time of the request.
+
+    Nested serializers are built by ``to_representation`` and so fall inside
+    the outer serializer's time. Top-level ``many=True`` lists are plain
+    ``ListSerializer``s; views time those with :func:`timed` themselves.
+    """
+
+    @property
+    def data(self):
+        with timed('serializer'):
+            return super().data
+
+
+class PerformanceMiddleware:
+    """Measure query count, DB time, serializer time and total time per request.
+
+    Disabled unless ``PERFORMANCE_METRICS_ENABLED`` is set, in which case
+    Django drops it from the middleware chain. The figures are sent in a
+    ``Server-Timing`` header and aggregated per route for ``/metrics``.
+    Queries run while a streamed body is consumed are not included. Works in
+    sync and async chains, so async views stay on the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFORMANCE_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            with self.wrap_connections(timing):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        # Connections are per thread and async ORM calls run their queries in
+        # the request's sync thread, so the wrappers are installed there.
+        stack = await sync_to_async(self.wrap_connections)(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current.reset(token)
+        return self.finish(request, response, timing, time.perf_counter() - start)
+
+    @staticmethod
+    def wrap_connections(timing):
+        """Time the queries of this thread's connections until the returned stack is closed."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timing.execute_wrapper))
+        return stack
+
+    def finish(self, request, response, timing, total):
+        match = request.resolver_match
+        route = match.route if match else 'unmatched'
+        registry.record(route, request.method, response.status_code, total, timing)
+        response['Server-Timing'] = (
+            f'db;desc="{timing.queries} queries";dur={timing.db * 1000:.2f}, '
+            f'serializer;dur={timing.serializer * 1000:.2f}, '
+            f'total;dur={total * 1000:.2f}'
+        )
+        return response
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data.encode(self.charset) if isinstance(data, str) else str(data).encode(self.charset)
+
+
+class MetricsView(APIView):
+    """Expose the aggregated request metrics to staff users."""
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,63 @@
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+REPLICA_ALIAS = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+class PrimaryReplicaRouter:
+    """Route reads of safe API requests to the replica, everything else to the primary.
+
+    Reads only go to the replica while ``ReplicaReadMiddleware`` marks the
+    current request as read-only, so write requests, management commands
+    and background work always read their own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get() and REPLICA_ALIAS in settings.DATABASES:
+            return REPLICA_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaReadMiddleware:
+    """Mark safe requests as read-only for :class:`PrimaryReplicaRouter`.
+
+    Works in sync and async chains, so async views stay on the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_from_replica.set(request.method in SAFE_METHODS)
+        try:
+            return self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+
+    async def __acall__(self, request):
+        token = _read_from_replica.set(request.method in SAFE_METHODS)
+        try:
+            return await self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -54,7 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    
+    'core.routers.ReplicaReadMiddleware',
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -89,13 +91,43 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite profile for concurrent traffic: WAL lets readers run while a writer
+# commits, writers wait for the lock instead of failing, and transactions take
+# the write lock up front so they cannot deadlock on upgrade.
+SQLITE_OPTIONS = {
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA busy_timeout=5000;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=134217728;'
+        'PRAGMA cache_size=-20000;'
+    ),
+    'transaction_mode': 'IMMEDIATE',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+        # Django does not support persistent connections under ASGI, so they
+        # are off by default and core.wsgi turns them on for WSGI workers.
+        'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 0)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Optional read replica (a copy of the primary kept in sync outside Django).
+# Safe API requests read from it, see core.routers.
+if os.environ.get('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DATABASE_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -148,6 +180,36 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES' : [
-        'rest_framework.authentication.TokenAuthentication'
+        'user_auth_app.authentication.CachedTokenAuthentication'
     ]
 }
+
+# Seconds a resolved auth token stays cached (see user_auth_app.authentication)
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+
+# Seconds the board ids a user can reach stay cached (see dashboard_app.membership)
+BOARD_ACCESS_CACHE_TIMEOUT = 300
+
+# Pub/sub backend of the board event stream and its heartbeat in seconds
+BOARD_EVENT_BROKER = 'dashboard_app.events.LocalBroker'
+BOARD_EVENT_HEARTBEAT = 15
+
+# Delta sync: overlap of sync tokens in seconds and tombstone retention in days
+SYNC_TOKEN_OVERLAP = 2
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+
+# Agenda: tasks listed per bucket and seconds an agenda stays cached (see dashboard_app.agenda)
+AGENDA_BUCKET_SIZE = 20
+AGENDA_CACHE_TIMEOUT = 300
+
+# Rows fetched and rendered per chunk by streamed list responses
+LIST_STREAM_CHUNK_SIZE = 500
+
+# Rows read per chunk by board exports and written per transaction by board imports
+BOARD_TRANSFER_CHUNK_SIZE = 1000
+
+# Per-request timing (Server-Timing header and the staff-only /metrics endpoint)
+PERFORMANCE_METRICS_ENABLED = os.environ.get('PERFORMANCE_METRICS_ENABLED') == '1'
+
+# Threads hashing passwords for the async login view (see user_auth_app.backends)
+LOGIN_HASH_WORKERS = 4
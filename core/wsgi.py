@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Keep database connections open between requests of a worker thread.
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '600')
 
 application = get_wsgi_application()
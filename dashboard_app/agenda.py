@@ -0,0 +1,87 @@
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Q, Value, When
+from django.utils import timezone
+
+from dashboard_app.api.values import TaskValuesSerializer
+from dashboard_app.membership import accessible_board_ids
+from dashboard_app.models import Board, Task
+
+BUCKETS = ('overdue', 'today', 'this_week', 'later')
+
+
+def bucket_filters(today):
+    """Return the due date filter of each bucket; the week ends on Sunday."""
+    week_end = today + datetime.timedelta(days=6 - today.weekday())
+    return {
+        'overdue': Q(due_date__lt=today),
+        'today': Q(due_date=today),
+        'this_week': Q(due_date__gt=today, due_date__lte=week_end),
+        'later': Q(due_date__gt=week_end),
+    }
+
+
+def open_tasks(board_ids):
+    """Return the tasks of the boards that are not done yet."""
+    return Task.objects.filter(board_id__in=board_ids).exclude(status=Task.Status.DONE)
+
+
+def bucket_counts(board_ids, today):
+    """Count the open and the high priority tasks of every bucket in one grouped query."""
+    filters = bucket_filters(today)
+    bucket = Case(*[When(condition, then=Value(name)) for name, condition in filters.items()], output_field=CharField())
+    rows = (
+        open_tasks(board_ids).annotate(bucket=bucket).values('bucket')
+        .annotate(count=Count('id'), urgent_count=Count('id', filter=Q(priority=Task.Priority.HIGH)))
+        .order_by()
+    )
+    counts = {name: {'count': 0, 'urgent_count': 0} for name in BUCKETS}
+    for row in rows:
+        counts[row['bucket']] = {'count': row['count'], 'urgent_count': row['urgent_count']}
+    return counts
+
+
+def build_agenda(board_ids, today, limit):
+    """Return the counts and the first ``limit`` tasks of every bucket.
+
+    Buckets without tasks are not queried; the others are read with one
+    bounded query each, ordered by due date.
+    """
+    counts = bucket_counts(board_ids, today)
+    buckets = {}
+    for name, condition in bucket_filters(today).items():
+        tasks = []
+        if counts[name]['count']:
+            queryset = open_tasks(board_ids).filter(condition).order_by('due_date', 'id')
+            tasks = TaskValuesSerializer.serialize(TaskValuesSerializer.values(queryset)[:limit])
+        buckets[name] = {**counts[name], 'tasks': tasks}
+    return {
+        'date': today.isoformat(),
+        'urgent_count': sum(bucket['urgent_count'] for bucket in buckets.values()),
+        'buckets': buckets,
+    }
+
+
+def get_agenda(user):
+    """Return the agenda of the user, cached per user.
+
+    The cache key holds the date and the versions of the user's boards.
+    Every task change bumps the version of its board, and membership
+    changes change the set of boards, so either one moves the user to a
+    new key.
+    """
+    board_ids = accessible_board_ids(user)
+    today = timezone.localdate()
+    digest = hashlib.sha1(today.isoformat().encode())
+    for board_id, version in Board.objects.filter(id__in=board_ids).order_by('id').values_list('id', 'version'):
+        digest.update(f'{board_id}:{version};'.encode())
+    key = f'agenda:{user.pk}:{digest.hexdigest()}'
+
+    agenda = cache.get(key)
+    if agenda is None:
+        agenda = build_agenda(board_ids, today, getattr(settings, 'AGENDA_BUCKET_SIZE', 20))
+        cache.set(key, agenda, getattr(settings, 'AGENDA_CACHE_TIMEOUT', 300))
+    return agenda
@@ -0,0 +1,162 @@
+from django.conf import settings
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags
+from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.request import Request
+
+from core.async_views import AsyncAPIView, json_response
+from dashboard_app.membership import aaccessible_board_ids, ais_board_member, ais_board_related
+from dashboard_app.models import Board, Task, Comment
+
+from .filters import TaskFilterBackend
+from .mixins import board_versions_etag
+from .pagination import CommentCursorPagination, TaskCursorPagination
+from .renderers import StreamingJSONRenderer
+from .serializer import BoardSerializer, TaskSerializer
+from .values import BoardListValuesSerializer, TaskCommentValuesSerializer, TaskValuesSerializer
+
+
+class AsyncBoardVersionETagMixin:
+    """Async :class:`BoardVersionETagMixin`; views build the body in ``get_response``."""
+
+    def get_etag_boards(self):
+        raise NotImplementedError
+
+    async def get_board_versions(self):
+        return [pair async for pair in self.get_etag_boards().order_by('id').values_list('id', 'version')]
+
+    async def get(self, request, *args, **kwargs):
+        etag = board_versions_etag(request, await self.get_board_versions())
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and etag in parse_etags(if_none_match):
+            response = HttpResponseNotModified()
+        else:
+            response = await self.get_response(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+
+
+class AsyncValuesListMixin:
+    """Async :class:`ValuesListMixin`: filter, paginate or stream ``values_list()`` rows."""
+
+    values_serializer_class = None
+    pagination_class = None
+    filter_backends = []
+    stream_list = False
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    async def get_response(self, request, *args, **kwargs):
+        # Filter backends and paginators read the query string through a DRF request.
+        drf_request = Request(request)
+        queryset = self.get_queryset()
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(drf_request, queryset, self)
+        serializer = self.values_serializer_class
+        queryset = serializer.values(queryset)
+
+        if self.pagination_class is not None:
+            paginator = self.pagination_class()
+            page = await paginator.apaginate_queryset(queryset, drf_request)
+            if page is not None:
+                return json_response({'next': paginator.get_next_link(), 'results': serializer.serialize(page)})
+        if self.stream_list:
+            return self.stream_response(serializer, queryset)
+        return json_response(serializer.serialize([row async for row in queryset]))
+
+    def stream_response(self, serializer, queryset):
+        chunk_size = getattr(settings, 'LIST_STREAM_CHUNK_SIZE', 500)
+        # Rows are read after the view returns, so pin the database chosen for this request.
+        rows = queryset.using(queryset.db).aiterator(chunk_size=chunk_size)
+        _, build = serializer.compile()
+        items = (build(row) async for row in rows)
+        renderer = StreamingJSONRenderer()
+        return StreamingHttpResponse(renderer.arender_stream(items, chunk_size), content_type=renderer.media_type)
+
+
+class AsyncBoardListView(AsyncValuesListMixin, AsyncAPIView):
+    """Async read-only :class:`BoardListView`."""
+    values_serializer_class = BoardListValuesSerializer
+
+    async def get(self, request):
+        return await self.get_response(request)
+
+    def get_queryset(self):
+        return Board.objects.filter(id__in=self.board_ids).order_by('id')
+
+    async def check_permissions(self, request):
+        await super().check_permissions(request)
+        self.board_ids = await aaccessible_board_ids(request.user)
+
+
+class AsyncBoardDetailView(AsyncBoardVersionETagMixin, AsyncAPIView):
+    """Async read-only :class:`BoardDetailView`."""
+
+    async def get_board_versions(self):
+        """Check access on the bare board before comparing versions."""
+        board = await Board.objects.only('id', 'owner_id', 'version').filter(pk=self.kwargs['pk']).afirst()
+        if board is None:
+            raise NotFound('No Board matches the given query.')
+        user = self.request.user
+        if not (user.is_superuser or await ais_board_related(user, board.id)):
+            raise PermissionDenied()
+        return [(board.id, board.version)]
+
+    async def get_response(self, request, pk):
+        board = await BoardSerializer.setup_eager_loading(Board.objects.select_related('owner')).aget(pk=pk)
+        return json_response(BoardSerializer(board).data)
+
+
+class AsyncTaskListView(AsyncBoardVersionETagMixin, AsyncValuesListMixin, AsyncAPIView):
+    """Async read-only :class:`TaskListView`."""
+    values_serializer_class = TaskValuesSerializer
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend]
+    stream_list = True
+
+    def get_etag_boards(self):
+        return Board.objects.all()
+
+    def get_queryset(self):
+        return TaskSerializer.setup_eager_loading(Task.objects.order_by('due_date', 'id'))
+
+
+class AsyncTaskListAssignToMeView(AsyncTaskListView):
+    """Async :class:`TaskListAssignToMeView`."""
+
+    def get_etag_boards(self):
+        return Board.objects.filter(tasks__assignee=self.request.user).distinct()
+
+    def get_queryset(self):
+        return super().get_queryset().filter(assignee=self.request.user)
+
+
+class AsyncTaskListReviewingMeView(AsyncTaskListView):
+    """Async :class:`TaskListReviewingMeView`."""
+
+    def get_etag_boards(self):
+        return Board.objects.filter(tasks__reviewer=self.request.user).distinct()
+
+    def get_queryset(self):
+        return super().get_queryset().filter(reviewer=self.request.user)
+
+
+class AsyncTaskCommentListView(AsyncBoardVersionETagMixin, AsyncValuesListMixin, AsyncAPIView):
+    """Async read-only :class:`TaskCommentListView`."""
+    values_serializer_class = TaskCommentValuesSerializer
+    pagination_class = CommentCursorPagination
+
+    async def check_permissions(self, request):
+        await super().check_permissions(request)
+        self.task = await Task.objects.only('id', 'board_id').filter(pk=self.kwargs['task_id']).afirst()
+        if self.task is None:
+            raise NotFound('Task not found.')
+        if not (request.user.is_superuser or await ais_board_member(request.user, self.task.board_id)):
+            raise PermissionDenied()
+
+    def get_etag_boards(self):
+        return Board.objects.filter(pk=self.task.board_id)
+
+    def get_queryset(self):
+        return Comment.objects.filter(task_id=self.task.id).select_related('user').order_by('-created_at', '-id')
@@ -0,0 +1,73 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from dashboard_app.models import Task
+
+# Accepted values of ``ordering`` and the unique orderings they stand for.
+TASK_ORDERINGS = {
+    'due_date': ('due_date', 'id'),
+    '-due_date': ('-due_date', '-id'),
+    'created_at': ('created_at', 'id'),
+    '-created_at': ('-created_at', '-id'),
+    'updated_at': ('updated_at', 'id'),
+    '-updated_at': ('-updated_at', '-id'),
+}
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """Filter and order task lists by a whitelist of indexed query parameters.
+
+    ``board``, ``status``, ``priority`` and ``assignee`` accept one value or
+    a comma separated list; ``due_date__lte`` and ``due_date__gte`` take a
+    date. Every filter is applied to the one list query, where it can use
+    the composite indexes of the task table. Other parameters are ignored.
+    """
+
+    list_params = {
+        'board': ('board_id', models.BigIntegerField()),
+        'status': ('status', Task._meta.get_field('status')),
+        'priority': ('priority', Task._meta.get_field('priority')),
+        'assignee': ('assignee_id', models.BigIntegerField()),
+    }
+    date_params = ('due_date__lte', 'due_date__gte')
+    ordering_param = 'ordering'
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        filters, errors = {}, {}
+        for param, (lookup, field) in self.list_params.items():
+            if param not in params:
+                continue
+            try:
+                values = [self.clean(field, value) for value in params[param].split(',')]
+            except DjangoValidationError as exc:
+                errors[param] = exc.messages
+                continue
+            filters[f'{lookup}__in' if len(values) > 1 else lookup] = values if len(values) > 1 else values[0]
+
+        due_date = Task._meta.get_field('due_date')
+        for param in self.date_params:
+            if param in params:
+                try:
+                    filters[param] = due_date.to_python(params[param])
+                except DjangoValidationError as exc:
+                    errors[param] = exc.messages
+
+        ordering = params.get(self.ordering_param)
+        if ordering is not None and ordering not in TASK_ORDERINGS:
+            errors[self.ordering_param] = [f'Choose one of: {", ".join(TASK_ORDERINGS)}.']
+        if errors:
+            raise ValidationError(errors)
+
+        queryset = queryset.filter(**filters)
+        if ordering is not None:
+            queryset = queryset.order_by(*TASK_ORDERINGS[ordering])
+        return queryset
+
+    def clean(self, field, value):
+        value = field.to_python(value.strip())
+        if field.choices:
+            field.validate(value, None)
+        return value
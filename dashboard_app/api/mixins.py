@@ -0,0 +1,101 @@
+import hashlib
+
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.metrics import timed
+from dashboard_app.loaders import get_loader
+
+from .renderers import StreamingJSONRenderer
+
+
+def board_versions_etag(request, versions):
+    """Return the ETag of a response built from boards at these ``(id, version)`` pairs."""
+    digest = hashlib.sha1(f'{request.user.pk}:{request.get_full_path()}'.encode())
+    for board_id, version in versions:
+        digest.update(f'{board_id}:{version};'.encode())
+    return quote_etag(digest.hexdigest())
+
+
+class LoaderObjectMixin:
+    """Fetch the object of a detail view through the request loader.
+
+    The permission classes load the same object before the view runs, so
+    ``get_object`` reuses that instance instead of querying again.
+    """
+
+    def get_object(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_loader(self.request).load(self.get_queryset().model, self.kwargs[lookup_url_kwarg])
+        if obj is None:
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class BoardVersionETagMixin:
+    """Answer conditional GETs from the version of the boards behind a view.
+
+    Views return the boards their response depends on from
+    ``get_etag_boards``. The ETag is derived from those board versions and
+    the user and query string, so a matching ``If-None-Match`` is answered with 304
+    before any task or comment is loaded.
+    """
+
+    def get_etag_boards(self):
+        raise NotImplementedError
+
+    def get_board_versions(self):
+        """Return ``(id, version)`` pairs of the boards behind the response."""
+        return self.get_etag_boards().order_by('id').values_list('id', 'version')
+
+    def get_etag(self, request):
+        """Return the ETag for the current state of the boards."""
+        return board_versions_etag(request, self.get_board_versions())
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and etag in parse_etags(if_none_match):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+
+
+class ValuesListMixin:
+    """Answer list GETs through ``values_serializer_class``.
+
+    Rows are read with ``values_list()`` and rendered by the compiled
+    serializer; writes keep using ``serializer_class``. With
+    ``stream_list`` an unpaginated list is streamed as a JSON array while
+    the rows are read in chunks, so memory does not grow with the result.
+    """
+
+    values_serializer_class = None
+    stream_list = False
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.values_serializer_class
+        queryset = serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with timed('serializer'):
+                data = serializer.serialize(page)
+            return self.get_paginated_response(data)
+        if self.stream_list:
+            return self.stream_response(serializer, queryset)
+        with timed('serializer'):
+            data = serializer.serialize(queryset)
+        return Response(data)
+
+    def stream_response(self, serializer, queryset):
+        chunk_size = getattr(settings, 'LIST_STREAM_CHUNK_SIZE', 500)
+        # Rows are read after the view returns, so pin the database chosen for this request.
+        rows = serializer.iterate(queryset.using(queryset.db).iterator(chunk_size=chunk_size))
+        renderer = StreamingJSONRenderer()
+        return StreamingHttpResponse(renderer.render_stream(rows, chunk_size), content_type=renderer.media_type)
@@ -0,0 +1,196 @@
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .filters import TASK_ORDERINGS
+
+
+class KeysetCursorPagination(BasePagination):
+    """Keyset pagination over a unique ordering with opaque cursors.
+
+    Each page is fetched with a ``WHERE (a, b) > (x, y)`` style filter on the
+    last row of the previous page, so the cost of a page does not depend on
+    how deep the client has paged. Pagination is opt-in: it only applies when
+    the request carries a ``cursor`` or ``page_size`` parameter, otherwise
+    the view returns the plain list as before.
+    """
+
+    ordering = ('id',)
+    ordering_query_param = None
+    orderings = {}
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_requested(self, request):
+        """Return True if the client asked for a paginated response."""
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_ordering(self, request):
+        """Return the ordering picked with ``ordering_query_param``, or the default."""
+        if self.ordering_query_param:
+            return self.orderings.get(request.query_params.get(self.ordering_query_param), self.ordering)
+        return self.ordering
+
+    def get_page_size(self, request):
+        """Return the requested page size clamped to ``max_page_size``."""
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of rows, or None when pagination is not requested."""
+        if not self.is_requested(request):
+            return None
+        queryset, size = self.page_queryset(queryset, request)
+        return self.take_page(list(queryset[:size + 1]), size)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async :meth:`paginate_queryset` reading the page with the async ORM."""
+        if not self.is_requested(request):
+            return None
+        queryset, size = self.page_queryset(queryset, request)
+        return self.take_page([row async for row in queryset[:size + 1]], size)
+
+    def page_queryset(self, queryset, request):
+        """Return the ordered queryset after the cursor position and the page size."""
+        self.request = request
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request)
+        size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.build_filter(position))
+        return queryset, size
+
+    def take_page(self, rows, size):
+        """Trim the look-ahead row and remember where the next page starts."""
+        self.has_next = len(rows) > size
+        rows = rows[:size]
+        self.next_position = self.get_position(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        """Return the URL of the next page or None on the last page."""
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_position(self, obj):
+        """Return the ordering values of a row as strings."""
+        return [
+            self.model._meta.get_field(name.lstrip('-')).value_to_string(obj)
+            for name in self.ordering
+        ]
+
+    def build_filter(self, position):
+        """Build the keyset condition that selects rows after ``position``."""
+        conditions = []
+        for index, name in enumerate(self.ordering):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            equal = {prev.lstrip('-'): position[i] for i, prev in enumerate(self.ordering[:index])}
+            conditions.append(Q(**equal, **{f'{field}__{lookup}': position[index]}))
+        return reduce(or_, conditions)
+
+    def encode_cursor(self, position):
+        """Encode a position into an opaque URL-safe token."""
+        raw = json.dumps(position, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        """Decode the cursor parameter into typed ordering values."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return self.parse_position(values)
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def parse_position(self, values):
+        """Convert decoded cursor values to the types of the ordering fields."""
+        return [
+            self.model._meta.get_field(name.lstrip('-')).to_python(value)
+            for name, value in zip(self.ordering, values)
+        ]
+
+
+class TaskCursorPagination(KeysetCursorPagination):
+    """Tasks ordered by due date, ties broken by id, unless ``ordering`` picks another order."""
+    ordering = ('due_date', 'id')
+    ordering_query_param = 'ordering'
+    orderings = TASK_ORDERINGS
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    """Comments newest first, ties broken by id."""
+    ordering = ('-created_at', '-id')
+
+
+class SearchCursorPagination(KeysetCursorPagination):
+    """Ranked search hits, paged by the ``(score, rowid)`` of the last hit.
+
+    Search results are always paginated.
+    """
+    ordering = ('score', 'rowid')
+    page_size = 20
+    max_page_size = 100
+
+    def is_requested(self, request):
+        return True
+
+    def paginate_hits(self, fetch, request):
+        """Return one page of hits from ``fetch(limit, after)``."""
+        self.request = request
+        size = self.get_page_size(request)
+        hits = fetch(size + 1, self.decode_cursor(request))
+        self.has_next = len(hits) > size
+        hits = hits[:size]
+        self.next_position = [hits[-1]['score'], hits[-1]['rowid']] if self.has_next else None
+        for hit in hits:
+            del hit['rowid']
+        return hits
+
+    def parse_position(self, values):
+        score, rowid = values
+        if isinstance(rowid, bool) or not isinstance(rowid, int):
+            raise ValueError
+        return [float(score), rowid]
@@ -1,6 +1,8 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework.exceptions import NotFound
+from dashboard_app.loaders import get_loader
 from dashboard_app.models import Task
+from dashboard_app.membership import is_board_member, is_board_related
 
 
 
@@ -23,9 +25,8 @@ class IsAuthenticatedAndBoardRelatedOrSuperUser(BasePermission):
         user = request.user
         return (
             user and user.is_authenticated and (
-                user == obj.owner or
-                obj.members.filter(id=user.id).exists() or
-                user.is_superuser
+                user.is_superuser or
+                is_board_related(user, obj.id)
             )
         )
         
@@ -55,7 +56,7 @@ class IsAuthenticatedAndBoardMember(BasePermission):
         return request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        return request.user.is_superuser or request.user in obj.board.members.all()
+        return request.user.is_superuser or is_board_member(request.user, obj.board_id)
 
 
 class IsAuthenticatedAndRevieingOrSuperUser(BasePermission):
@@ -79,14 +80,12 @@ class IsAuthenticatedAndRevieingOrSuperUser(BasePermission):
 class IsAuthenticatedAndTaskRelatedOrSuperUser(BasePermission):
     """Allow if user is related to the task or is superuser."""
     def has_permission(self, request, view):
-        task_id = view.kwargs.get('pk')
-        try:
-            task = Task.objects.select_related('board').get(id=task_id)
-        except Task.DoesNotExist:
+        task = get_loader(request).load(Task, view.kwargs.get('pk'))
+        if task is None:
             raise NotFound("Task not found.")
         
         user = request.user
-        return user.is_superuser or user in task.board.members.all()
+        return user.is_superuser or is_board_member(user, task.board_id)
 
 
     def has_object_permission(self, request, view, obj):
@@ -105,15 +104,12 @@ class IsAuthenticatedAndTaskRelatedOrSuperUser(BasePermission):
 class IsAuthenticatedAndCommentRelatedOrSuperUser(BasePermission):
     """Allow if user is related to the task or is superuser."""
     def has_permission(self, request, view):
-        task_id = view.kwargs.get('task_id')
-        print(task_id)
-        try:
-            task = Task.objects.select_related('board').get(id=task_id)
-        except Task.DoesNotExist:
+        task = get_loader(request).load(Task, view.kwargs.get('task_id'))
+        if task is None:
             raise NotFound("Task not found.")
         
         user = request.user
-        return user.is_superuser or user in task.board.members.all()
+        return user.is_superuser or is_board_member(user, task.board_id)
 
 
     def has_object_permission(self, request, view, obj):
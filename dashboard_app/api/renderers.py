@@ -0,0 +1,39 @@
+from itertools import islice
+
+from rest_framework.renderers import JSONRenderer
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    """JSON renderer that can emit a list in chunks.
+
+    Each chunk is rendered as a list by ``JSONRenderer`` and spliced into
+    one array, so the streamed bytes equal those of rendering the whole
+    list at once.
+    """
+
+    def render_stream(self, items, chunk_size):
+        """Yield the JSON array of ``items`` in chunks of ``chunk_size`` items."""
+        items = iter(items)
+        separator = b'['
+        while True:
+            chunk = list(islice(items, chunk_size))
+            if not chunk:
+                break
+            yield separator + self.render(chunk)[1:-1]
+            separator = b','
+        yield b'[]' if separator == b'[' else b']'
+
+    async def arender_stream(self, items, chunk_size):
+        """Async :meth:`render_stream` over an async iterable of items."""
+        separator = b'['
+        chunk = []
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                yield separator + self.render(chunk)[1:-1]
+                separator = b','
+                chunk = []
+        if chunk:
+            yield separator + self.render(chunk)[1:-1]
+            separator = b','
+        yield b'[]' if separator == b'[' else b']'
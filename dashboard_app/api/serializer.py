@@ -1,7 +1,50 @@
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from dashboard_app.models import Board, Task, Comment
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Prefetch
 from rest_framework.exceptions import NotFound
+from core.metrics import TimedSerializerMixin
+from dashboard_app.loaders import get_loader
+
+
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+    """Many-related field that resolves all primary keys in a single query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        pks = []
+        for pk in data:
+            if isinstance(pk, bool):
+                child.fail('incorrect_type', data_type=type(pk).__name__)
+            try:
+                pks.append(child.queryset.model._meta.pk.to_python(pk))
+            except (TypeError, ValueError, DjangoValidationError):
+                child.fail('incorrect_type', data_type=type(pk).__name__)
+
+        found = child.get_queryset().in_bulk(pks)
+        for pk in pks:
+            if pk not in found:
+                child.fail('does_not_exist', pk_value=pk)
+        return [found[pk] for pk in dict.fromkeys(pks)]
+
+
+class BatchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field whose ``many=True`` form validates in one query."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -18,7 +61,7 @@ class UserSerializer(serializers.ModelSerializer):
         return f'{obj.first_name} {obj.last_name}'.strip()
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for task with user info and comment count."""
     
     assignee = UserSerializer(read_only=True)
@@ -35,16 +78,17 @@ class TaskSerializer(serializers.ModelSerializer):
         queryset=Board.objects.all(), required=True
     )
 
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Task
         fields = '__all__'
-        read_only_fields = ['id', 'creator', 'created_at']
+        read_only_fields = ['id', 'creator', 'created_at', 'rank']
 
-    def get_comments_count(self, obj):
-        """Return number of comments on the task."""
-        return obj.comments.count()
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load the assignee and reviewer together with the tasks."""
+        return queryset.select_related('assignee', 'reviewer')
 
     def create(self, validated_data):
         """Set the task creator to the current user."""
@@ -61,7 +105,77 @@ class TaskSerializer(serializers.ModelSerializer):
         return value
 
 
-class TaskCommentSerializer(serializers.ModelSerializer):
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """Serializer for one item of a bulk task request.
+
+    Boards and users are resolved from the ``boards`` and ``users`` maps in
+    the context, which the view loads once for the whole request.
+    """
+
+    board = serializers.IntegerField()
+    assignee_id = serializers.IntegerField()
+    reviewer_id = serializers.IntegerField()
+
+    class Meta:
+        model = Task
+        fields = ['board', 'title', 'description', 'due_date', 'priority', 'status', 'assignee_id', 'reviewer_id']
+
+    def validate_board(self, value):
+        board = self.context['boards'].get(value)
+        if board is None:
+            raise serializers.ValidationError("Board not found.")
+        return board
+
+    def validate_user(self, value):
+        user = self.context['users'].get(value)
+        if user is None:
+            raise serializers.ValidationError(f'Invalid pk "{value}" - object does not exist.')
+        return user
+
+    validate_assignee_id = validate_user
+    validate_reviewer_id = validate_user
+
+    def validate(self, data):
+        """Map the user id fields onto the model relations."""
+        for field, relation in (('assignee_id', 'assignee'), ('reviewer_id', 'reviewer')):
+            if field in data:
+                data[relation] = data.pop(field)
+        return data
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """Serializer for moving a task within or between status columns."""
+
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    before = serializers.IntegerField(required=False, allow_null=True)
+    after = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, data):
+        """Resolve the neighbour cards and check they share the target column."""
+        task = self.context['task']
+        status = data.get('status', task.status)
+        ids = [data.get(key) for key in ('before', 'after') if data.get(key) is not None]
+        if task.id in ids:
+            raise serializers.ValidationError("A task cannot be its own neighbour.")
+
+        neighbours = {
+            card_id: card for card_id, card in get_loader(self.context['request']).load_many(Task, ids).items()
+            if (card.board_id, card.status) == (task.board_id, status)
+        }
+        for key in ('before', 'after'):
+            card_id = data.get(key)
+            if card_id is not None and card_id not in neighbours:
+                raise serializers.ValidationError({key: "Task not found in the target column."})
+            data[key] = neighbours.get(card_id)
+
+        before, after = data['before'], data['after']
+        if before and after and (after.rank, after.id) >= (before.rank, before.id):
+            raise serializers.ValidationError("The 'after' task must come before the 'before' task.")
+        data['status'] = status
+        return data
+
+
+class TaskCommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for a comment with author name."""
     
     user = UserSerializer(read_only=True)
@@ -83,13 +197,13 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         return Comment.objects.create(content=validated_data['content'], user=request.user, task=task)
 
 
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for board with task stats and members."""
 
     owner_id = serializers.SerializerMethodField()
     
     tasks = TaskSerializer(many=True, read_only=True)
-    members = serializers.PrimaryKeyRelatedField(
+    members = BatchedPrimaryKeyRelatedField(
         many=True,
         queryset=User.objects.all()
     )
@@ -105,12 +219,17 @@ class BoardSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['owner']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Prefetch members and tasks with their users and comment counts."""
+        tasks = TaskSerializer.setup_eager_loading(Task.objects.order_by('status', 'rank', 'id'))
+        return queryset.prefetch_related('members', Prefetch('tasks', queryset=tasks))
+
     def get_owner_id(self, obj):
-        return obj.owner.id
+        return obj.owner_id
 
     def validate(self, data):
         """General validation (can be extended)."""
-        print("Main validate called with:", data)
         return data
 
     def validate_members(self, value):
@@ -129,15 +248,24 @@ class BoardSerializer(serializers.ModelSerializer):
 
 
 
-class BoardListSerializer(serializers.ModelSerializer):
+class BoardSummarySerializer(BoardSerializer):
+    """Serializer for board fields and members without the task tree."""
+
+    tasks = None
+
+    class Meta(BoardSerializer.Meta):
+        fields = ['id', 'title', 'owner_id', 'members']
+
+
+class BoardListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for board with task stats and members."""
     
-    member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
-    owner_id = serializers.SerializerMethodField()
-    members = serializers.PrimaryKeyRelatedField(
+    member_count = serializers.IntegerField(read_only=True)
+    ticket_count = serializers.IntegerField(read_only=True)
+    tasks_to_do_count = serializers.IntegerField(read_only=True)
+    tasks_high_prio_count = serializers.IntegerField(read_only=True)
+    owner_id = serializers.IntegerField(read_only=True)
+    members = BatchedPrimaryKeyRelatedField(
         many=True,
         queryset=User.objects.all(),
         write_only=True 
@@ -145,26 +273,7 @@ class BoardListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Board
-        exclude = ['owner']
-
-    def get_owner_id(self, obj):
-        return obj.owner.id
-
-    def get_member_count(self, obj):
-        """Return number of board members."""
-        return obj.members.count()
-
-    def get_ticket_count(self, obj):
-        """Return total number of tasks."""
-        return obj.tasks.count()
-    
-    def get_tasks_to_do_count(self, obj):
-        """Return number of 'to-do' tasks."""
-        return obj.tasks.filter(status='to-do').count()
-
-    def get_tasks_high_prio_count(self, obj):
-        """Return number of high priority tasks."""
-        return obj.tasks.filter(priority='high').count()
+        exclude = ['owner', 'version', 'created_at', 'updated_at']
 
     def validate_members(self, value):
         """Disallow superusers as board members."""
@@ -172,8 +281,3 @@ class BoardListSerializer(serializers.ModelSerializer):
         if superusers:
             raise serializers.ValidationError("Superusers cannot be added as board members.")
         return value
-
-
-
-       
-
@@ -0,0 +1,80 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+
+from dashboard_app.events import get_broker
+from dashboard_app.membership import is_board_related
+from dashboard_app.models import Board
+from user_auth_app.authentication import CachedTokenAuthentication
+
+
+def authorize_stream(request, board_id):
+    """Return an error response if the caller may not watch the board.
+
+    ``EventSource`` cannot send headers, so the token may also be passed as
+    the ``token`` query parameter.
+    """
+    header = request.headers.get('Authorization', '').split()
+    if len(header) == 2 and header[0] == 'Token':
+        key = header[1]
+    else:
+        key = request.GET.get('token')
+    if not key:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    try:
+        user, _ = CachedTokenAuthentication().authenticate_credentials(key)
+    except AuthenticationFailed as exc:
+        return JsonResponse({'detail': str(exc.detail)}, status=401)
+
+    if not Board.objects.filter(pk=board_id).exists():
+        return JsonResponse({'detail': 'Board not found.'}, status=404)
+    if not (user.is_superuser or is_board_related(user, board_id)):
+        return JsonResponse({'detail': 'You do not have permission to perform this action.'}, status=403)
+    return None
+
+
+async def stream_events(board_id, heartbeat, once=False):
+    """Yield server-sent events for a board, with a comment as heartbeat.
+
+    With ``once`` the stream ends after the first event or heartbeat, which
+    turns it into a long-poll.
+    """
+    subscription = get_broker().subscribe(board_id)
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            event = await subscription.get(timeout=heartbeat)
+            if event is None:
+                yield ': ping\n\n'
+            else:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            if once:
+                return
+    finally:
+        subscription.close()
+
+
+@require_GET
+async def board_events(request, pk):
+    """Stream the change events of a board as ``text/event-stream``.
+
+    Under ASGI the connection stays open and only holds a coroutine. Under
+    WSGI a streaming response would pin a worker thread, so each request
+    answers as a long-poll instead and the client reconnects.
+    """
+    error = await sync_to_async(authorize_stream)(request, pk)
+    if error is not None:
+        return error
+
+    heartbeat = getattr(settings, 'BOARD_EVENT_HEARTBEAT', 15)
+    once = not isinstance(request, ASGIRequest)
+    response = StreamingHttpResponse(stream_events(pk, heartbeat, once), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,13 +1,29 @@
 from django.urls import path
-from .views import BoardListView, BoardDetailView, TaskListView, TaskCommentListView, TaskCommentDestroyView, TaskDetailView, TaskListAssignToMeView, TaskListReviewingMeView
+from .streams import board_events
+from .async_views import AsyncBoardListView, AsyncBoardDetailView, AsyncTaskListView, AsyncTaskListAssignToMeView, AsyncTaskListReviewingMeView, AsyncTaskCommentListView
+from .views import BoardListView, BoardDetailView, TaskListView, TaskCommentListView, TaskCommentDestroyView, TaskDetailView, TaskListAssignToMeView, TaskListReviewingMeView, TaskBulkView, TaskMoveView, BoardChangesView, SearchView, AgendaView, BoardExportView, BoardImportView
 
 urlpatterns = [
+    path('api/agenda/', AgendaView.as_view(), name='agenda'),
     path('api/boards/', BoardListView.as_view(), name='board-list'),
+    path('api/boards/async/', AsyncBoardListView.as_view(), name='board-list-async'),
+    path('api/boards/import/', BoardImportView.as_view(), name='board-import'),
     path('api/boards/<int:pk>/', BoardDetailView.as_view(), name='board-detail'),
+    path('api/boards/<int:pk>/async/', AsyncBoardDetailView.as_view(), name='board-detail-async'),
+    path('api/boards/<int:pk>/changes/', BoardChangesView.as_view(), name='board-changes'),
+    path('api/boards/<int:pk>/export.<str:fmt>', BoardExportView.as_view(), name='board-export'),
+    path('api/boards/<int:pk>/events/', board_events, name='board-events'),
+    path('api/search/', SearchView.as_view(), name='search'),
     path('api/tasks/', TaskListView.as_view(), name='task-list'),
+    path('api/tasks/async/', AsyncTaskListView.as_view(), name='task-list-async'),
+    path('api/tasks/bulk/', TaskBulkView.as_view(), name='task-bulk'),
     path('api/tasks/<int:pk>/', TaskDetailView.as_view(), name='task-detail'),
+    path('api/tasks/<int:pk>/move/', TaskMoveView.as_view(), name='task-move'),
     path('api/tasks/assigned-to-me/', TaskListAssignToMeView.as_view(), name='task-detail-assigned-to-me'),
     path('api/tasks/reviewing/', TaskListReviewingMeView.as_view(), name='task-detail-assigned-to-me'),
+    path('api/tasks/assigned-to-me/async/', AsyncTaskListAssignToMeView.as_view(), name='task-list-assigned-to-me-async'),
+    path('api/tasks/reviewing/async/', AsyncTaskListReviewingMeView.as_view(), name='task-list-reviewing-async'),
     path('api/tasks/<int:task_id>/comments/', TaskCommentListView.as_view(), name='task-comment-list'),
+    path('api/tasks/<int:task_id>/comments/async/', AsyncTaskCommentListView.as_view(), name='task-comment-list-async'),
     path('api/tasks/<int:task_id>/comments/<int:pk>/', TaskCommentDestroyView.as_view(), name='task-comment-delete')
 ]
@@ -0,0 +1,104 @@
+from rest_framework import serializers
+
+from .serializer import BoardListSerializer, TaskCommentSerializer, TaskSerializer, UserSerializer
+
+# Fields whose to_representation() leaves database values unchanged.
+PLAIN_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.ChoiceField, serializers.BooleanField)
+
+
+def _full_name(first_name, last_name):
+    return f'{first_name} {last_name}'.strip()
+
+
+class ValuesSerializer:
+    """Read-only serializer that renders ``values_list()`` rows.
+
+    The readable fields of ``serializer_class`` are compiled once into a
+    column list and a row builder, so list endpoints skip model instances
+    and per-field dispatch while producing the same output. Method fields
+    are declared in ``method_fields`` as ``(sources, function)`` and nested
+    serializers in ``nested``.
+    """
+
+    serializer_class = None
+    method_fields = {}
+    nested = {}
+
+    @classmethod
+    def compile(cls):
+        """Return the ``(columns, build)`` pair, compiling it on first use."""
+        if '_compiled' not in cls.__dict__:
+            columns = {}
+            cls._compiled = (columns, cls._compile(columns, ''))
+        return cls._compiled
+
+    @classmethod
+    def _compile(cls, columns, prefix):
+        def column(source):
+            return columns.setdefault(prefix + source, len(columns))
+
+        steps = []
+        for name, field in cls.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if name in cls.method_fields:
+                sources, function = cls.method_fields[name]
+                steps.append((name, 'method', [column(source) for source in sources], function))
+            elif name in cls.nested:
+                build = cls.nested[name]._compile(columns, f'{prefix}{field.source}__')
+                steps.append((name, 'nested', column(field.source), build))
+            elif isinstance(field, serializers.RelatedField) or isinstance(field, PLAIN_FIELDS):
+                steps.append((name, 'value', column(field.source), None))
+            else:
+                steps.append((name, 'value', column(field.source), field.to_representation))
+
+        def build(row):
+            data = {}
+            for name, kind, index, convert in steps:
+                if kind == 'method':
+                    data[name] = convert(*[row[i] for i in index])
+                elif row[index] is None:
+                    data[name] = None
+                elif kind == 'nested':
+                    data[name] = convert(row)
+                else:
+                    data[name] = convert(row[index]) if convert else row[index]
+            return data
+
+        return build
+
+    @classmethod
+    def values(cls, queryset):
+        """Return the queryset as named rows holding every needed column."""
+        columns, _ = cls.compile()
+        return queryset.values_list(*columns, named=True)
+
+    @classmethod
+    def serialize(cls, rows):
+        return list(cls.iterate(rows))
+
+    @classmethod
+    def iterate(cls, rows):
+        """Yield the representation of each row as it is read."""
+        _, build = cls.compile()
+        return map(build, rows)
+
+
+class UserValuesSerializer(ValuesSerializer):
+    serializer_class = UserSerializer
+    method_fields = {'fullname': (('first_name', 'last_name'), _full_name)}
+
+
+class TaskValuesSerializer(ValuesSerializer):
+    serializer_class = TaskSerializer
+    nested = {'assignee': UserValuesSerializer, 'reviewer': UserValuesSerializer}
+
+
+class TaskCommentValuesSerializer(ValuesSerializer):
+    serializer_class = TaskCommentSerializer
+    method_fields = {'author': (('user__first_name', 'user__last_name'), _full_name)}
+    nested = {'user': UserValuesSerializer}
+
+
+class BoardListValuesSerializer(ValuesSerializer):
+    serializer_class = BoardListSerializer
@@ -3,29 +3,66 @@ from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied, NotFound
 from rest_framework.permissions import IsAuthenticated
-from dashboard_app.models import Board, Task, Comment
+from dashboard_app.models import Board, Task, Comment, Tombstone
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django.shortcuts import get_object_or_404
+from core.metrics import timed
+from dashboard_app.agenda import get_agenda
+from dashboard_app.counters import BoardChanges
+from dashboard_app.events import publish_board_event
+from dashboard_app.loaders import get_loader
+from dashboard_app.membership import accessible_board_ids, is_board_member
+from dashboard_app.search import build_match_query, search
+from dashboard_app.ranking import last_ranks, move_task, rank_between
+from dashboard_app.transfer import BoardImportError, BoardImporter, export_records, parse_csv, parse_ndjson, render_csv, render_ndjson
+from dashboard_app.sync import next_sync_token, parse_sync_token, record_tombstones, tombstone_retention, touch_moved_comments
 from rest_framework import status
 
-from .serializer import BoardSerializer, TaskSerializer, TaskCommentSerializer, BoardListSerializer
+from .mixins import BoardVersionETagMixin, LoaderObjectMixin, ValuesListMixin
+from .filters import TaskFilterBackend
+from .pagination import TaskCursorPagination, CommentCursorPagination, SearchCursorPagination
+from .values import BoardListValuesSerializer, TaskValuesSerializer, TaskCommentValuesSerializer
+from .serializer import BoardSerializer, TaskSerializer, TaskCommentSerializer, BoardListSerializer, TaskBulkItemSerializer, TaskMoveSerializer, BoardSummarySerializer
 from .permissions import IsAuthenticatedAndTaskRelatedOrSuperUser, IsAuthenticateAndNotGuestUser, IsAuthenticatedAndSelf, IsAuthenticatedAndBoardRelatedOrSuperUser, IsAuthenticatedAndTAssignToMeOrSuperUser, IsAuthenticatedAndRevieingOrSuperUser, IsAuthenticatedAndBoardMember, IsAuthenticatedAndCommentRelatedOrSuperUser
 
-class BoardListView(generics.ListCreateAPIView):
-    """List all boards or create a new one."""
+class BoardListView(ValuesListMixin, generics.ListCreateAPIView):
+    """List the boards of the current user or create a new one."""
     permission_classes = [IsAuthenticated]
-    queryset = Board.objects.all()
     serializer_class = BoardListSerializer
+    values_serializer_class = BoardListValuesSerializer
+
+    def get_queryset(self):
+        """Return owned or joined boards; the counters are stored columns."""
+        return Board.objects.filter(id__in=accessible_board_ids(self.request.user)).order_by('id')
 
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
+        board = serializer.save(owner=self.request.user)
+        serializer.instance = self.get_queryset().get(pk=board.pk)
 
 
-class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BoardDetailView(BoardVersionETagMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a board."""
     permission_classes = [IsAuthenticatedAndBoardRelatedOrSuperUser]
     queryset = Board.objects.all()
     serializer_class = BoardSerializer
 
+    def get_queryset(self):
+        """Load the full task tree for reads and only the owner for writes."""
+        queryset = Board.objects.select_related('owner')
+        if self.request.method == 'GET':
+            return BoardSerializer.setup_eager_loading(queryset)
+        return queryset
+
+    def get_board_versions(self):
+        """Check access on the bare board before comparing versions."""
+        board = get_object_or_404(Board.objects.only('id', 'owner_id', 'version'), pk=self.kwargs['pk'])
+        self.check_object_permissions(self.request, board)
+        return [(board.id, board.version)]
+
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=True)
@@ -53,11 +90,67 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 
-class TaskListView(generics.ListCreateAPIView):
+class BoardChangesView(generics.GenericAPIView):
+    """Return the board rows changed since a sync token.
+
+    Without ``since`` (or with a token older than the tombstone retention)
+    the whole board is returned with ``reset`` set, so the client replaces
+    its local copy. The response carries the token for the next call.
+    """
+    permission_classes = [IsAuthenticatedAndBoardRelatedOrSuperUser]
+    queryset = Board.objects.all()
+
+    def get(self, request, *args, **kwargs):
+        board = self.get_object()
+        token = next_sync_token()
+
+        since = None
+        if request.query_params.get('since'):
+            try:
+                since = parse_sync_token(request.query_params['since'])
+            except (TypeError, ValueError, OverflowError, OSError):
+                return Response({'Error': 'Invalid sync token.'}, status=status.HTTP_400_BAD_REQUEST)
+            if since < timezone.now() - tombstone_retention():
+                since = None
+
+        tasks = TaskSerializer.setup_eager_loading(board.tasks.order_by('status', 'rank', 'id'))
+        comments = Comment.objects.filter(task__board=board).select_related('user').order_by('id')
+        deleted = {'tasks': [], 'comments': []}
+        if since is not None:
+            tasks = tasks.filter(updated_at__gt=since)
+            comments = comments.filter(updated_at__gt=since)
+            tombstones = board.tombstones.filter(deleted_at__gt=since).values_list('kind', 'object_id')
+            for kind, object_id in tombstones:
+                deleted[f'{kind}s'].append(object_id)
+
+        board_changed = since is None or board.updated_at > since
+        context = self.get_serializer_context()
+        board_data = BoardSummarySerializer(board, context=context).data if board_changed else None
+        with timed('serializer'):
+            task_data = TaskSerializer(tasks, many=True, context=context).data
+            comment_data = TaskCommentSerializer(comments, many=True, context=context).data
+        return Response({
+            'token': token,
+            'reset': since is None,
+            'board': board_data,
+            'tasks': task_data,
+            'comments': comment_data,
+            'deleted': deleted,
+        }, status=status.HTTP_200_OK)
+
+
+class TaskListView(BoardVersionETagMixin, ValuesListMixin, generics.ListCreateAPIView):
     """List all tasks or create a new one."""
     permission_classes = [IsAuthenticatedAndBoardMember]
-    queryset = Task.objects.all()
+    queryset = TaskSerializer.setup_eager_loading(Task.objects.order_by('due_date', 'id'))
     serializer_class = TaskSerializer
+    values_serializer_class = TaskValuesSerializer
+    stream_list = True
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend]
+
+    def get_etag_boards(self):
+        return Board.objects.all()
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -67,63 +160,259 @@ class TaskListView(generics.ListCreateAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def perform_create(self, serializer):
-        board_id = self.request.data.get('board')
-        if not board_id:
+        board = serializer.validated_data.get('board')
+        if board is None:
             raise NotFound("Board ID is required.")
 
-        try:
-            board = Board.objects.get(id=board_id)
-        except Board.DoesNotExist:
-            raise NotFound("Board not found.")
-
         user = self.request.user
-        print(user)
-        if not user.is_superuser and user not in board.members.all():
+        if not user.is_superuser and not is_board_member(user, board.id):
             raise PermissionDenied("You are not a member of this board.")
 
         serializer.save(creator=user)
     
 
-class TaskListAssignToMeView(generics.ListAPIView):
+def _as_id(value):
+    """Return ``value`` as an integer id, or None if it is not one."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TaskBulkView(APIView):
+    """Create, update or move many tasks in one request.
+
+    The body is a list of task objects. Items with an ``id`` update that
+    task, all others create a new one. Boards and users referenced by the
+    items are loaded in batched queries and all valid items are written in
+    one transaction; the response reports the outcome of every item.
+    """
+    permission_classes = [IsAuthenticated]
+    max_items = 500
+
+    def post(self, request):
+        items = request.data
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return Response({'Error': 'Expected a list of tasks.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.max_items:
+            return Response({'Error': f'At most {self.max_items} tasks per request.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        loader = get_loader(request)
+        task_ids = {_as_id(item['id']) for item in items if 'id' in item} - {None}
+        tasks = loader.load_many(Task, task_ids)
+        board_ids = {_as_id(item.get('board')) for item in items} | {task.board_id for task in tasks.values()}
+        user_ids = {_as_id(item.get(field)) for item in items for field in ('assignee_id', 'reviewer_id')}
+        context = {
+            'request': request,
+            'boards': loader.load_many(Board, board_ids - {None}),
+            'users': loader.load_many(User, user_ids - {None}),
+        }
+
+        results, seen = [], set()
+        to_create, to_update, update_fields = [], [], set()
+        for item in items:
+            task = tasks.get(_as_id(item['id'])) if 'id' in item else None
+            if 'id' in item and task is None:
+                results.append({'status': 'error', 'errors': {'id': ['Task not found.']}})
+                continue
+            if task is not None and task.pk in seen:
+                results.append({'status': 'error', 'errors': {'id': ['Duplicate task in request.']}})
+                continue
+            if task is not None:
+                seen.add(task.pk)
+
+            serializer = TaskBulkItemSerializer(task, data=item, partial=task is not None, context=context)
+            if not serializer.is_valid():
+                results.append({'status': 'error', 'errors': serializer.errors})
+                continue
+
+            data = serializer.validated_data
+            error = self.check_item_permission(request.user, task, data.get('board'))
+            if error:
+                results.append({'status': 'error', 'errors': {'detail': error}})
+                continue
+
+            if task is None:
+                task = Task(creator=request.user, **data)
+                to_create.append(task)
+                results.append({'status': 'created', 'task': task})
+            else:
+                task._moved_from_board_id = task.board_id
+                for field, value in data.items():
+                    setattr(task, field, value)
+                update_fields.update(data)
+                to_update.append(task)
+                results.append({'status': 'updated', 'task': task})
+
+        if self.assign_ranks(to_create, to_update):
+            update_fields.add('rank')
+        now = timezone.now()
+        for task in to_update:
+            task.updated_at = now
+        update_fields.add('updated_at')
+
+        with transaction.atomic():
+            Task.objects.bulk_create(to_create)
+            if to_update:
+                Task.objects.bulk_update(to_update, sorted(update_fields))
+            changes = BoardChanges()
+            for task in to_create:
+                changes.add_task(task.board_id, task.status, task.priority)
+                changes.bump(task.board_id)
+            for task in to_update:
+                changes.move_task(
+                    (task._moved_from_board_id, task._loaded_status, task._loaded_priority),
+                    (task.board_id, task.status, task.priority),
+                )
+                changes.bump(task._moved_from_board_id)
+                changes.bump(task.board_id)
+            changes.apply()
+            for task in to_create:
+                publish_board_event(task.board_id, 'task.created', task.id)
+            moved = [task for task in to_update if task._moved_from_board_id != task.board_id]
+            record_tombstones(Tombstone.Kind.TASK, [(task._moved_from_board_id, task.id) for task in moved])
+            touch_moved_comments([task.id for task in moved])
+            for task in moved:
+                publish_board_event(task._moved_from_board_id, 'task.deleted', task.id)
+            for task in to_update:
+                publish_board_event(task.board_id, 'task.updated', task.id)
+
+        return self.build_response(results, to_create)
+
+    def assign_ranks(self, created, updated):
+        """Append new tasks and tasks that changed column to their column.
+
+        Returns True if any updated task got a new rank.
+        """
+        moved = [
+            task for task in updated
+            if (task._moved_from_board_id, task._loaded_status) != (task.board_id, task.status)
+        ]
+        columns = {(task.board_id, task.status) for task in created + moved}
+        if not columns:
+            return False
+        last = last_ranks(columns)
+        for task in created + moved:
+            column = (task.board_id, task.status)
+            task.rank = last[column] = rank_between(last.get(column, ''), '')
+        return bool(moved)
+
+    def check_item_permission(self, user, task, board):
+        """Return an error message if the user may not write this item."""
+        if user.is_superuser:
+            return None
+        if task is not None:
+            if not is_board_member(user, task.board_id):
+                return "You are not a member of this board."
+            if user.id not in (task.assignee_id, task.creator_id, task.reviewer_id):
+                return "You do not have permission to perform this action."
+        if board is not None and not is_board_member(user, board.id):
+            return "You are not a member of this board."
+        return None
+
+    def build_response(self, results, created):
+        """Serialize the written tasks and pick the overall status code."""
+        for task in created:
+            task.comments_count = 0
+        for result in results:
+            if 'task' in result:
+                result['task'] = TaskSerializer(result['task'], context={'request': self.request}).data
+
+        errors = sum(result['status'] == 'error' for result in results)
+        if errors and errors == len(results):
+            code = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_200_OK
+        return Response({'results': results}, status=code)
+
+
+class TaskListAssignToMeView(BoardVersionETagMixin, ValuesListMixin, generics.ListAPIView):
     """List tasks assigned to the current user."""
     permission_classes = [IsAuthenticatedAndTAssignToMeOrSuperUser]
     serializer_class = TaskSerializer
+    values_serializer_class = TaskValuesSerializer
+    stream_list = True
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend]
+
+    def get_etag_boards(self):
+        return Board.objects.filter(tasks__assignee=self.request.user).distinct()
 
     def get_queryset(self):
         user = self.request.user
-        return Task.objects.filter(assignee=user)
+        return TaskSerializer.setup_eager_loading(Task.objects.filter(assignee=user).order_by('due_date', 'id'))
 
 
-class TaskListReviewingMeView(generics.ListAPIView):
+class TaskListReviewingMeView(BoardVersionETagMixin, ValuesListMixin, generics.ListAPIView):
     """List tasks where the current user is the reviewer."""
     permission_classes = [IsAuthenticatedAndRevieingOrSuperUser]
     serializer_class = TaskSerializer
+    values_serializer_class = TaskValuesSerializer
+    stream_list = True
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend]
+
+    def get_etag_boards(self):
+        return Board.objects.filter(tasks__reviewer=self.request.user).distinct()
 
     def get_queryset(self):
         user = self.request.user
-        return Task.objects.filter(reviewer=user)
+        return TaskSerializer.setup_eager_loading(Task.objects.filter(reviewer=user).order_by('due_date', 'id'))
 
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(LoaderObjectMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a task."""
     permission_classes = [IsAuthenticatedAndTaskRelatedOrSuperUser]
-    queryset = Task.objects.all()
+    queryset = TaskSerializer.setup_eager_loading(Task.objects.all())
     serializer_class = TaskSerializer
 
 
 
-class TaskCommentListView(generics.ListCreateAPIView):
+class TaskMoveView(LoaderObjectMixin, generics.GenericAPIView):
+    """Move a task to a position within a status column."""
+    permission_classes = [IsAuthenticatedAndTaskRelatedOrSuperUser]
+    queryset = TaskSerializer.setup_eager_loading(Task.objects.all())
+    serializer_class = TaskSerializer
+
+    def check_permissions(self, request):
+        # The neighbour cards are fetched in one query with the task the permission check loads.
+        data = request.data if isinstance(request.data, dict) else {}
+        get_loader(request).want(Task, *(data.get(key) for key in ('before', 'after')))
+        super().check_permissions(request)
+
+    def post(self, request, *args, **kwargs):
+        task = self.get_object()
+        serializer = TaskMoveSerializer(data=request.data, context={'task': task, 'request': request})
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            move_task(task, **serializer.validated_data)
+        return Response(self.get_serializer(task).data, status=status.HTTP_200_OK)
+
+
+class TaskCommentListView(BoardVersionETagMixin, ValuesListMixin, generics.ListCreateAPIView):
     """List or create comments for a specific task."""
     permission_classes = [IsAuthenticatedAndCommentRelatedOrSuperUser]
     queryset = Comment.objects.all()
     serializer_class = TaskCommentSerializer
+    values_serializer_class = TaskCommentValuesSerializer
+    pagination_class = CommentCursorPagination
+
+    def get_etag_boards(self):
+        return Board.objects.filter(pk=self.get_task().board_id)
 
     def get_queryset(self):
         task_id = self.kwargs['task_id']
-        return Comment.objects.filter(task_id=task_id).order_by('-created_at')
+        return Comment.objects.filter(task_id=task_id).select_related('user').order_by('-created_at', '-id')
     
     def get_task(self):
-        return get_object_or_404(Task, id=self.kwargs['task_id'])
+        task = get_loader(self.request).load(Task, self.kwargs['task_id'])
+        if task is None:
+            raise NotFound("Task not found.")
+        return task
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -141,3 +430,64 @@ class TaskCommentDestroyView(generics.DestroyAPIView):
     serializer_class = TaskCommentSerializer
 
 
+class SearchView(APIView):
+    """Full-text search over the tasks and comments of the user's boards."""
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchCursorPagination
+
+    def get(self, request):
+        match = build_match_query(request.query_params.get('q'))
+        if match is None:
+            return Response({'q': ['Enter at least one word to search for.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        board_ids = accessible_board_ids(request.user)
+        paginator = self.pagination_class()
+        hits = paginator.paginate_hits(lambda limit, after: search(match, board_ids, limit, after), request)
+        return paginator.get_paginated_response(hits)
+
+
+class AgendaView(APIView):
+    """Open tasks of the user's boards bucketed into overdue, today, this week and later."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(get_agenda(request.user))
+
+
+class BoardExportView(APIView):
+    """Stream a board with its tasks and comments as NDJSON or CSV."""
+    permission_classes = [IsAuthenticatedAndBoardRelatedOrSuperUser]
+    formats = {
+        'ndjson': (render_ndjson, 'application/x-ndjson'),
+        'csv': (render_csv, 'text/csv'),
+    }
+
+    def get(self, request, pk, fmt):
+        if fmt not in self.formats:
+            raise NotFound('Export as ndjson or csv.')
+        board = get_object_or_404(Board.objects.select_related('owner'), pk=pk)
+        self.check_object_permissions(request, board)
+
+        render, content_type = self.formats[fmt]
+        records = export_records(board, settings.BOARD_TRANSFER_CHUNK_SIZE)
+        response = StreamingHttpResponse(render(records), content_type=f'{content_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="board-{board.id}.{fmt}"'
+        return response
+
+
+class BoardImportView(APIView):
+    """Create a board owned by the current user from an NDJSON or CSV export.
+
+    The request body is read line by line while the records are written in
+    batches, so large exports do not have to fit in memory.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        parse = parse_csv if request.content_type.startswith('text/csv') else parse_ndjson
+        importer = BoardImporter(request.user, settings.BOARD_TRANSFER_CHUNK_SIZE)
+        try:
+            importer.run(parse(request.stream or []))
+        except (BoardImportError, UnicodeDecodeError) as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(importer.summary(), status=status.HTTP_201_CREATED)
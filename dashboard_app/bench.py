@@ -0,0 +1,258 @@
+import random
+import statistics
+import time
+import tracemalloc
+import warnings
+from collections import Counter
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from dashboard_app.counters import board_counter_expressions, repair_counters, task_counter_expressions
+from dashboard_app.models import Board, Comment, Task
+from dashboard_app.ranking import evenly_spaced_ranks
+from dashboard_app.transfer import export_records, render_ndjson
+
+BENCH_PASSWORD = 'bench-password'
+
+WORDS = (
+    'api backend bug cache client deploy design docs feature fix frontend index login '
+    'migration mobile onboarding release report review search signup sprint test ui'
+).split()
+
+
+def seed(users=20, boards=10, tasks=50, comments=3, seed=0):
+    """Create deterministic users, boards, tasks and comments.
+
+    The first user is a member of every board and the assignee of every
+    third task, so it can reach every endpoint. Returns a dict describing
+    the seeded data for the endpoint definitions.
+    """
+    rnd = random.Random(seed)
+    password = make_password(BENCH_PASSWORD)
+    people = User.objects.bulk_create([
+        User(username=f'bench{i}', email=f'bench{i}@example.com', first_name=rnd.choice(WORDS).title(),
+             last_name=f'User{i}', password=password)
+        for i in range(users)
+    ])
+    Token.objects.bulk_create([Token(key=f'{i:040x}', user=user) for i, user in enumerate(people)])
+    main = people[0]
+
+    board_list = Board.objects.bulk_create([
+        Board(owner=rnd.choice(people), title=f'{rnd.choice(WORDS).title()} board {i}') for i in range(boards)
+    ])
+    members = {board.id: [main] + rnd.sample(people[1:], min(len(people) - 1, 4)) for board in board_list}
+    Board.members.through.objects.bulk_create([
+        Board.members.through(board_id=board_id, user_id=user.id)
+        for board_id, users_of_board in members.items() for user in users_of_board
+    ])
+
+    task_list = []
+    start = date(2025, 1, 1)
+    for board in board_list:
+        for i in range(tasks):
+            task_list.append(Task(
+                board=board, title=' '.join(rnd.choices(WORDS, k=4)), description=' '.join(rnd.choices(WORDS, k=20)),
+                due_date=start + timedelta(days=rnd.randrange(120)),
+                priority=rnd.choice(Task.Priority.values), status=rnd.choice(Task.Status.values),
+                creator=rnd.choice(members[board.id]),
+                assignee=main if i % 3 == 0 else rnd.choice(members[board.id]),
+                reviewer=rnd.choice(members[board.id]),
+            ))
+    columns = {}
+    for task in task_list:
+        columns.setdefault((task.board_id, task.status), []).append(task)
+    for column in columns.values():
+        for task, rank in zip(column, evenly_spaced_ranks(len(column))):
+            task.rank = rank
+    Task.objects.bulk_create(task_list, batch_size=500)
+
+    Comment.objects.bulk_create([
+        Comment(task=task, user=rnd.choice(members[task.board_id]), content=' '.join(rnd.choices(WORDS, k=12)))
+        for task in task_list for _ in range(comments)
+    ], batch_size=500)
+    repair_counters(Board, board_counter_expressions())
+    repair_counters(Task, task_counter_expressions())
+
+    own_tasks = [task for task in task_list if task.assignee_id == main.id]
+    return {
+        'user': main,
+        'other': people[1] if len(people) > 1 else main,
+        'board': board_list[0],
+        'task': own_tasks[0],
+        'tasks': own_tasks,
+    }
+
+
+class Endpoint:
+    """One benchmarked request.
+
+    ``path`` and ``data`` are values or callables taking the seeded data
+    and the iteration number; callables may create the objects a request
+    needs, e.g. a fresh task to delete. Bodies are sent as JSON unless a
+    ``content_type`` is given, in which case ``data`` is the raw body.
+    """
+
+    def __init__(self, name, method, path, data=None, authenticated=True, content_type=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.authenticated = authenticated
+        self.content_type = content_type
+
+    def build(self, data, iteration):
+        path = self.path(data, iteration) if callable(self.path) else self.path
+        body = self.data(data, iteration) if callable(self.data) else self.data
+        return path, body
+
+
+def _new_board(data, i):
+    return Board.objects.create(owner=data['user'], title=f'Scratch {i}')
+
+
+def _new_task(data, i):
+    return Task.objects.create(
+        board=data['board'], title=f'Scratch {i}', due_date='2025-06-01', priority='low', status='to-do',
+        creator=data['user'], assignee=data['user'], reviewer=data['other'],
+    )
+
+
+def _board_export(data, i):
+    if 'export' not in data:
+        records = export_records(data['board'], settings.BOARD_TRANSFER_CHUNK_SIZE)
+        data['export'] = ''.join(render_ndjson(records))
+    return data['export']
+
+
+def _task_payload(data, i):
+    return {
+        'board': data['board'].id, 'title': f'New task {i}', 'description': 'Created by the benchmark',
+        'due_date': '2025-06-01', 'priority': 'medium', 'status': 'to-do',
+        'assignee_id': data['user'].id, 'reviewer_id': data['other'].id,
+    }
+
+
+ENDPOINTS = [
+    Endpoint('agenda', 'get', '/api/agenda/'),
+    Endpoint('boards.list', 'get', '/api/boards/'),
+    Endpoint('boards.list_async', 'get', '/api/boards/async/'),
+    Endpoint('boards.create', 'post', '/api/boards/', lambda d, i: {'title': f'Board {i}', 'members': [d['other'].id]}),
+    Endpoint('boards.detail', 'get', lambda d, i: f"/api/boards/{d['board'].id}/"),
+    Endpoint('boards.detail_async', 'get', lambda d, i: f"/api/boards/{d['board'].id}/async/"),
+    Endpoint('boards.update', 'patch', lambda d, i: f"/api/boards/{d['board'].id}/", lambda d, i: {'title': f'Renamed {i}'}),
+    Endpoint('boards.delete', 'delete', lambda d, i: f'/api/boards/{_new_board(d, i).id}/'),
+    Endpoint('boards.changes', 'get', lambda d, i: f"/api/boards/{d['board'].id}/changes/"),
+    Endpoint('boards.export', 'get', lambda d, i: f"/api/boards/{d['board'].id}/export.ndjson"),
+    Endpoint('boards.import', 'post', '/api/boards/import/', _board_export, content_type='application/x-ndjson'),
+    Endpoint('boards.events', 'get', lambda d, i: f"/api/boards/{d['board'].id}/events/"),
+    Endpoint('search', 'get', lambda d, i: f'/api/search/?q={WORDS[i % len(WORDS)]}'),
+    Endpoint('tasks.list', 'get', '/api/tasks/'),
+    Endpoint('tasks.list_async', 'get', '/api/tasks/async/'),
+    Endpoint('tasks.list_page', 'get', '/api/tasks/?page_size=50'),
+    Endpoint('tasks.create', 'post', '/api/tasks/', _task_payload),
+    Endpoint('tasks.bulk', 'post', '/api/tasks/bulk/', lambda d, i: [
+        {'id': task.id, 'title': f'Bulk {i}'} for task in d['tasks'][:20]
+    ] + [_task_payload(d, i) for _ in range(5)]),
+    Endpoint('tasks.detail', 'get', lambda d, i: f"/api/tasks/{d['task'].id}/"),
+    Endpoint('tasks.update', 'patch', lambda d, i: f"/api/tasks/{d['task'].id}/", lambda d, i: {'title': f'Task {i}'}),
+    Endpoint('tasks.delete', 'delete', lambda d, i: f'/api/tasks/{_new_task(d, i).id}/'),
+    Endpoint('tasks.move', 'post', lambda d, i: f"/api/tasks/{d['task'].id}/move/",
+             lambda d, i: {'status': Task.Status.values[i % len(Task.Status.values)]}),
+    Endpoint('tasks.assigned_to_me', 'get', '/api/tasks/assigned-to-me/'),
+    Endpoint('tasks.assigned_to_me_async', 'get', '/api/tasks/assigned-to-me/async/'),
+    Endpoint('tasks.reviewing', 'get', '/api/tasks/reviewing/'),
+    Endpoint('tasks.reviewing_async', 'get', '/api/tasks/reviewing/async/'),
+    Endpoint('comments.list', 'get', lambda d, i: f"/api/tasks/{d['task'].id}/comments/"),
+    Endpoint('comments.list_async', 'get', lambda d, i: f"/api/tasks/{d['task'].id}/comments/async/"),
+    Endpoint('comments.create', 'post', lambda d, i: f"/api/tasks/{d['task'].id}/comments/",
+             lambda d, i: {'content': f'Comment {i}'}),
+    Endpoint('comments.delete', 'delete', lambda d, i: '/api/tasks/{0}/comments/{1}/'.format(
+        d['task'].id, Comment.objects.create(task=d['task'], user=d['user'], content='Scratch').id)),
+    Endpoint('auth.registration', 'post', '/api/registration/', lambda d, i: {
+        'fullname': f'New User{i}', 'email': f'new{i}@example.com',
+        'password': BENCH_PASSWORD, 'repeated_password': BENCH_PASSWORD,
+    }, authenticated=False),
+    Endpoint('auth.login', 'post', '/api/login/', lambda d, i: {
+        'email': d['user'].email, 'password': BENCH_PASSWORD,
+    }, authenticated=False),
+    Endpoint('auth.login_async', 'post', '/api/login/async/', lambda d, i: {
+        'email': d['user'].email, 'password': BENCH_PASSWORD,
+    }, authenticated=False),
+    Endpoint('auth.email_check', 'get', lambda d, i: f"/api/email-check/?email={d['other'].email}"),
+    Endpoint('auth.email_check_async', 'get', lambda d, i: f"/api/email-check/async/?email={d['other'].email}"),
+]
+
+
+def percentile(quantiles, p):
+    return round(quantiles[p - 1], 3) if quantiles else None
+
+
+def run_endpoint(endpoint, data, iterations, offset=0):
+    """Run one endpoint and return its latency, query and memory figures.
+
+    Latency is measured over ``iterations`` plain requests after one
+    warm-up request. Query count and allocated memory come from one more
+    request made under query capture and ``tracemalloc``, so their overhead
+    does not skew the timings.
+    """
+    client = APIClient()
+    if endpoint.authenticated:
+        client.credentials(HTTP_AUTHORIZATION=f"Token {data['user'].auth_token.key}")
+
+    encoding = {'content_type': endpoint.content_type} if endpoint.content_type else {'format': 'json'}
+
+    def call(path, body):
+        start = time.perf_counter()
+        response = getattr(client, endpoint.method)(path, body, **encoding)
+        if response.streaming:
+            b''.join(response)
+        return time.perf_counter() - start, response.status_code
+
+    call(*endpoint.build(data, offset))
+    timings, statuses = [], Counter()
+    for iteration in range(1, iterations + 1):
+        elapsed, code = call(*endpoint.build(data, offset + iteration))
+        timings.append(elapsed * 1000)
+        statuses[code] += 1
+
+    request = endpoint.build(data, offset + iterations + 1)
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            _, code = call(*request)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    statuses[code] += 1
+
+    quantiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+    return {
+        'method': endpoint.method.upper(),
+        'requests': iterations,
+        'p50_ms': percentile(quantiles, 50),
+        'p95_ms': percentile(quantiles, 95),
+        'p99_ms': percentile(quantiles, 99),
+        'queries': len(queries),
+        'peak_alloc_kib': round(peak / 1024, 1),
+        'status': {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def run(data, iterations, names=None):
+    """Benchmark all endpoints (or those whose name contains one of ``names``)."""
+    results = {}
+    with warnings.catch_warnings():
+        # The event stream is an async view served by the sync test client.
+        warnings.filterwarnings('ignore', message='StreamingHttpResponse must consume asynchronous iterators')
+        for index, endpoint in enumerate(ENDPOINTS):
+            if names and not any(name in endpoint.name for name in names):
+                continue
+            results[endpoint.name] = run_endpoint(endpoint, data, iterations, offset=index * (iterations + 2))
+    return results
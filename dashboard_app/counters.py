@@ -0,0 +1,109 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from dashboard_app.models import Board, Task, Comment
+
+BOARD_COUNTERS = ['member_count', 'ticket_count', 'tasks_to_do_count', 'tasks_high_prio_count']
+
+
+def task_counters(status, priority):
+    """Return the board counters a task with this status and priority adds to."""
+    counters = {'ticket_count': 1}
+    if status == Task.Status.TODO:
+        counters['tasks_to_do_count'] = 1
+    if priority == Task.Priority.HIGH:
+        counters['tasks_high_prio_count'] = 1
+    return counters
+
+
+class BoardChanges:
+    """Collects counter deltas and version bumps, applied as one UPDATE per board."""
+
+    def __init__(self):
+        self.deltas = defaultdict(lambda: defaultdict(int))
+
+    def bump(self, board_id):
+        """Bump the version of a board once, however often it is called."""
+        if board_id is not None:
+            self.deltas[board_id]['version'] = 1
+
+    def add_task(self, board_id, status, priority, sign=1):
+        """Count a task in (``sign=1``) or out of (``sign=-1``) a board."""
+        if board_id is None:
+            return
+        for counter, value in task_counters(status, priority).items():
+            self.deltas[board_id][counter] += sign * value
+
+    def move_task(self, old, new):
+        """Move a task between ``(board_id, status, priority)`` states."""
+        if old != new:
+            self.add_task(*old, sign=-1)
+            self.add_task(*new)
+
+    def apply(self, touch=False):
+        """Write all collected changes with F() expressions."""
+        for board_id, delta in self.deltas.items():
+            changes = {field: F(field) + value for field, value in delta.items() if value}
+            if touch:
+                changes['updated_at'] = timezone.now()
+            if changes:
+                Board.objects.filter(pk=board_id).update(**changes)
+        self.deltas.clear()
+
+
+def change_comment_count(task_id, delta):
+    """Adjust the stored comment count of a task and mark it changed for delta sync."""
+    Task.objects.filter(pk=task_id).update(comments_count=F('comments_count') + delta, updated_at=timezone.now())
+
+
+def refresh_member_counts(*board_ids):
+    """Recount the members of boards and bump their version in one UPDATE."""
+    board_ids = {board_id for board_id in board_ids if board_id is not None}
+    if board_ids:
+        Board.objects.filter(id__in=board_ids).update(
+            member_count=member_count_subquery(),
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+
+
+def member_count_subquery():
+    """Return an expression counting the members of the outer board."""
+    through = Board.members.through.objects.filter(board_id=OuterRef('pk'))
+    return _count(through, 'board_id')
+
+
+def _count(queryset, group_field):
+    counts = queryset.order_by().values(group_field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def board_counter_expressions():
+    """Return expressions computing every stored board counter from scratch."""
+    tasks = Task.objects.filter(board_id=OuterRef('pk'))
+    return {
+        'member_count': member_count_subquery(),
+        'ticket_count': _count(tasks, 'board_id'),
+        'tasks_to_do_count': _count(tasks.filter(status=Task.Status.TODO), 'board_id'),
+        'tasks_high_prio_count': _count(tasks.filter(priority=Task.Priority.HIGH), 'board_id'),
+    }
+
+
+def task_counter_expressions():
+    """Return expressions computing the stored task counters from scratch."""
+    return {'comments_count': _count(Comment.objects.filter(task_id=OuterRef('pk')), 'task_id')}
+
+
+def repair_counters(model, expressions):
+    """Recompute stored counters and return how many rows had drifted."""
+    expected = {f'expected_{field}': expression for field, expression in expressions.items()}
+    drifted = reduce(or_, (~Q(**{field: F(f'expected_{field}')}) for field in expressions))
+    drifted_ids = list(model.objects.annotate(**expected).filter(drifted).values_list('id', flat=True))
+    if drifted_ids:
+        model.objects.filter(id__in=drifted_ids).update(**expressions)
+    return len(drifted_ids)
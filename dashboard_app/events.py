@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class BaseBroker:
+    """Interface of the pub/sub backends behind the board event stream.
+
+    ``publish`` may be called from any thread; ``subscribe`` is called from
+    the event loop serving the stream and returns an object with an async
+    ``get(timeout)`` method and a ``close()`` method.
+    """
+
+    def publish(self, board_id, event):
+        raise NotImplementedError
+
+    def subscribe(self, board_id):
+        raise NotImplementedError
+
+
+class LocalSubscription:
+    """A queue of events for one stream of a :class:`LocalBroker`."""
+
+    def __init__(self, broker, board_id, max_size):
+        self.broker = broker
+        self.board_id = board_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_size)
+
+    def deliver(self, event):
+        """Queue an event on the loop thread, dropping it if the client lags."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self, timeout=None):
+        """Return the next event, or None if ``timeout`` seconds pass first."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker(BaseBroker):
+    """In-process broker fanning events out to the streams of this process.
+
+    Only streams served by the same process receive events, so deployments
+    with several worker processes need a shared broker behind the same
+    interface.
+    """
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def publish(self, board_id, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(board_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def subscribe(self, board_id):
+        subscription = LocalSubscription(self, board_id, self.max_queue_size)
+        with self.lock:
+            self.subscriptions[board_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscribers = self.subscriptions.get(subscription.board_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscriptions[subscription.board_id]
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """Return the broker configured in ``BOARD_EVENT_BROKER``."""
+    path = getattr(settings, 'BOARD_EVENT_BROKER', 'dashboard_app.events.LocalBroker')
+    return import_string(path)()
+
+
+def publish_board_event(board_id, event_type, object_id=None):
+    """Publish a change event for a board once the transaction commits."""
+    if board_id is None:
+        return
+    event = {'type': event_type, 'board': board_id, 'id': object_id}
+    transaction.on_commit(lambda: get_broker().publish(board_id, event))
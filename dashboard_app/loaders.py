@@ -0,0 +1,64 @@
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+
+from dashboard_app.models import Board, Task
+
+LOADER_QUERYSETS = {
+    Task: lambda: Task.objects.select_related('assignee', 'reviewer', 'creator'),
+    Board: lambda: Board.objects.all(),
+    User: lambda: User.objects.all(),
+}
+
+
+class RequestLoader:
+    """Identity map of the tasks, boards and users used by one request.
+
+    Objects are cached by primary key, so permission classes, views and
+    serializers that ask for the same object share one instance. Keys
+    queued with ``want`` are fetched together on the next lookup of that
+    model, with one query per model.
+    """
+
+    def __init__(self):
+        self.cache = defaultdict(dict)
+        self.pending = defaultdict(set)
+
+    def _key(self, model, pk):
+        try:
+            return model._meta.pk.to_python(pk)
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def want(self, model, *pks):
+        """Queue keys to be fetched with the next lookup of the model."""
+        cached = self.cache[model]
+        self.pending[model].update(
+            key for key in (self._key(model, pk) for pk in pks) if key is not None and key not in cached
+        )
+
+    def load_many(self, model, pks):
+        """Return a ``{pk: instance}`` dict of the keys that exist."""
+        self.want(model, *pks)
+        pending = self.pending.pop(model, None)
+        cached = self.cache[model]
+        if pending:
+            found = LOADER_QUERYSETS[model]().in_bulk(pending)
+            for key in pending:
+                cached[key] = found.get(key)
+        keys = (self._key(model, pk) for pk in pks)
+        return {key: cached[key] for key in keys if cached.get(key) is not None}
+
+    def load(self, model, pk):
+        """Return one instance, or None if it does not exist."""
+        return self.load_many(model, [pk]).get(self._key(model, pk))
+
+
+def get_loader(request):
+    """Return the loader of a request, creating it on first use."""
+    request = getattr(request, '_request', request)
+    loader = getattr(request, 'loader', None)
+    if loader is None:
+        loader = request.loader = RequestLoader()
+    return loader
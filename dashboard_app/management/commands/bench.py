@@ -0,0 +1,54 @@
+import json
+import platform
+
+import django
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from dashboard_app import bench
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database with deterministic data, drive every API endpoint in-process '
+        'and print p50/p95/p99 latency, query count and allocated memory per endpoint as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--tasks', type=int, default=50, help='Tasks per board.')
+        parser.add_argument('--comments', type=int, default=3, help='Comments per task.')
+        parser.add_argument('--iterations', type=int, default=30, help='Timed requests per endpoint.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--endpoint', action='append', help='Only run endpoints whose name contains this.')
+        parser.add_argument('--output', help='Write the report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            # Heartbeat 0 makes the long-poll event endpoint answer immediately.
+            with override_settings(BOARD_EVENT_HEARTBEAT=0):
+                data = bench.seed(
+                    users=options['users'], boards=options['boards'], tasks=options['tasks'],
+                    comments=options['comments'], seed=options['seed'],
+                )
+                results = bench.run(data, options['iterations'], options['endpoint'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'config': {key: options[key] for key in ('users', 'boards', 'tasks', 'comments', 'iterations', 'seed')},
+            'environment': {'python': platform.python_version(), 'django': django.get_version()},
+            'endpoints': results,
+        }
+        content = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(content + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Wrote {len(results)} endpoint result(s) to {options['output']}."))
+        else:
+            self.stdout.write(content)
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard_app.models import Board
+from dashboard_app.transfer import export_records, render_csv, render_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Write a board with its tasks and comments as NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board_id', type=int)
+        parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+        parser.add_argument('--output', help='File to write to instead of stdout.')
+        parser.add_argument('--chunk-size', type=int, default=settings.BOARD_TRANSFER_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        board = Board.objects.select_related('owner').filter(pk=options['board_id']).first()
+        if board is None:
+            raise CommandError(f'Board {options["board_id"]} does not exist.')
+
+        render = render_csv if options['format'] == 'csv' else render_ndjson
+        chunks = render(export_records(board, max(1, options['chunk_size'])))
+        if options['output']:
+            try:
+                with open(options['output'], 'w', newline='', encoding='utf-8') as handle:
+                    handle.writelines(chunks)
+            except OSError as exc:
+                raise CommandError(exc)
+            self.stderr.write(self.style.SUCCESS(f'Exported board {board.id} to {options["output"]}.'))
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
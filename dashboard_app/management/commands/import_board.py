@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard_app.transfer import BoardImportError, BoardImporter, parse_csv, parse_ndjson
+from user_auth_app.utils import users_with_email
+
+
+class Command(BaseCommand):
+    help = (
+        'Create a board from an NDJSON or CSV export. The owner becomes the owner of the '
+        'new board; other users are matched by email.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Export file to import.')
+        parser.add_argument('--owner', required=True, help='Email of the user who owns the new board.')
+        parser.add_argument('--format', choices=['ndjson', 'csv'], help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=settings.BOARD_TRANSFER_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        owner = users_with_email(options['owner']).first()
+        if owner is None:
+            raise CommandError(f'No user with email {options["owner"]!r}.')
+
+        file_format = options['format'] or ('csv' if options['path'].endswith('.csv') else 'ndjson')
+        parse = parse_csv if file_format == 'csv' else parse_ndjson
+        importer = BoardImporter(owner, options['batch_size'])
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as handle:
+                importer.run(parse(handle))
+        except (OSError, UnicodeDecodeError, BoardImportError) as exc:
+            raise CommandError(exc)
+
+        summary = importer.summary()
+        for email in summary['unknown_users']:
+            self.stderr.write(f'Unknown user {email}, left unassigned.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported board {summary["id"]} with {summary["tasks"]} task(s) and {summary["comments"]} comment(s).'
+        ))
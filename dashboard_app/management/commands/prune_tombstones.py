@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dashboard_app.models import Tombstone
+from dashboard_app.sync import tombstone_retention
+
+
+class Command(BaseCommand):
+    help = 'Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS.'
+
+    def handle(self, *args, **options):
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - tombstone_retention()).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstone(s).'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.db.models.functions import Length
+
+from dashboard_app.models import Task
+from dashboard_app.ranking import rebalance_column
+
+
+class Command(BaseCommand):
+    help = 'Rewrite the ranks of status columns whose card ranks grew too long.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-length', type=int, default=12, help='Rebalance columns with ranks longer than this.')
+        parser.add_argument('--board', type=int, help='Only rebalance the columns of this board.')
+
+    def handle(self, *args, **options):
+        columns = Task.objects.values_list('board_id', 'status').annotate(longest=Max(Length('rank')))
+        if options['board']:
+            columns = columns.filter(board_id=options['board'])
+        columns = [(board_id, status) for board_id, status, longest in columns if longest > options['min_length']]
+
+        for board_id, status in columns:
+            rebalance_column(board_id, status)
+        self.stdout.write(self.style.SUCCESS(f'Rebalanced {len(columns)} column(s).'))
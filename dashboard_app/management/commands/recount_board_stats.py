@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from dashboard_app.counters import board_counter_expressions, repair_counters, task_counter_expressions
+from dashboard_app.models import Board, Task
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored board and task counters and repair any drift.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            boards = repair_counters(Board, board_counter_expressions())
+            tasks = repair_counters(Task, task_counter_expressions())
+        self.stdout.write(self.style.SUCCESS(f'Repaired {boards} board(s) and {tasks} task(s).'))
@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Value
+
+from dashboard_app.models import Board
+
+
+def _cache_key(user_id):
+    return f'board-access:{user_id}'
+
+
+def _access_rows(user):
+    """Return ``(board_id, is_owner)`` rows of the owned and joined boards."""
+    return (
+        Board.objects.filter(owner=user).values_list('id', Value(True))
+        .union(Board.members.through.objects.filter(user=user).values_list('board_id', Value(False)), all=True)
+    )
+
+
+def get_board_access(user):
+    """Return ``(owned_ids, member_ids)`` of the boards the user can reach.
+
+    Both sets are loaded in one query and cached per user until a signal
+    in ``dashboard_app.signals`` invalidates them.
+    """
+    if not user or not user.is_authenticated:
+        return frozenset(), frozenset()
+
+    key = _cache_key(user.id)
+    access = cache.get(key)
+    if access is None:
+        owned, member = set(), set()
+        for board_id, is_owner in _access_rows(user):
+            (owned if is_owner else member).add(board_id)
+        access = (frozenset(owned), frozenset(member))
+        cache.set(key, access, getattr(settings, 'BOARD_ACCESS_CACHE_TIMEOUT', 300))
+    return access
+
+
+async def aget_board_access(user):
+    """Async :func:`get_board_access` using the async cache and ORM."""
+    if not user or not user.is_authenticated:
+        return frozenset(), frozenset()
+
+    key = _cache_key(user.id)
+    access = await cache.aget(key)
+    if access is None:
+        owned, member = set(), set()
+        async for board_id, is_owner in _access_rows(user):
+            (owned if is_owner else member).add(board_id)
+        access = (frozenset(owned), frozenset(member))
+        await cache.aset(key, access, getattr(settings, 'BOARD_ACCESS_CACHE_TIMEOUT', 300))
+    return access
+
+
+def accessible_board_ids(user):
+    """Return ids of boards the user owns or is a member of."""
+    owned, member = get_board_access(user)
+    return owned | member
+
+
+def is_board_member(user, board_id):
+    """Return True if the user is listed in the board members."""
+    return board_id in get_board_access(user)[1]
+
+
+def is_board_related(user, board_id):
+    """Return True if the user owns the board or is one of its members."""
+    owned, member = get_board_access(user)
+    return board_id in owned or board_id in member
+
+
+def invalidate_board_access(*user_ids):
+    """Drop the cached board access of the given users."""
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids if user_id is not None])
+
+
+async def aaccessible_board_ids(user):
+    """Async :func:`accessible_board_ids`."""
+    owned, member = await aget_board_access(user)
+    return owned | member
+
+
+async def ais_board_member(user, board_id):
+    """Async :func:`is_board_member`."""
+    return board_id in (await aget_board_access(user))[1]
+
+
+async def ais_board_related(user, board_id):
+    """Async :func:`is_board_related`."""
+    return board_id in await aaccessible_board_ids(user)
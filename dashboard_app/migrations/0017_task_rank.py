@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def rank_existing_tasks(apps, schema_editor):
+    """Give every column evenly spaced ranks in id order."""
+    Task = apps.get_model('dashboard_app', 'Task')
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    columns = {}
+    for task in Task.objects.order_by('id').only('id', 'board_id', 'status'):
+        columns.setdefault((task.board_id, task.status), []).append(task)
+
+    for tasks in columns.values():
+        width = 1
+        while len(digits) ** width <= len(tasks):
+            width += 1
+        step = len(digits) ** width // (len(tasks) + 1)
+        for position, task in enumerate(tasks, start=1):
+            value, rank = position * step, ''
+            for _ in range(width):
+                value, digit = divmod(value, len(digits))
+                rank = digits[digit] + rank
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard_app', '0016_board_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default='', editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status', 'rank', 'id'], name='task_board_column_rank_idx'),
+        ),
+        migrations.RunPython(rank_existing_tasks, migrations.RunPython.noop),
+    ]
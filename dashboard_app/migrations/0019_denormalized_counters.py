@@ -0,0 +1,62 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:32
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_field):
+    counts = queryset.order_by().values(group_field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def fill_counters(apps, schema_editor):
+    """Compute the initial counter values from the existing rows."""
+    Board = apps.get_model('dashboard_app', 'Board')
+    Task = apps.get_model('dashboard_app', 'Task')
+    Comment = apps.get_model('dashboard_app', 'Comment')
+
+    tasks = Task.objects.filter(board_id=OuterRef('pk'))
+    Board.objects.update(
+        member_count=_count(Board.members.through.objects.filter(board_id=OuterRef('pk')), 'board_id'),
+        ticket_count=_count(tasks, 'board_id'),
+        tasks_to_do_count=_count(tasks.filter(status='to-do'), 'board_id'),
+        tasks_high_prio_count=_count(tasks.filter(priority='high'), 'board_id'),
+    )
+    Task.objects.update(comments_count=_count(Comment.objects.filter(task_id=OuterRef('pk')), 'task_id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard_app', '0018_sync_timestamps_tombstones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='member_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_high_prio_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_to_do_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='ticket_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='comments_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations
+
+# Tasks are stored under rowid 2 * id and comments under 2 * id + 1, so the
+# triggers can address their row directly.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE dashboard_app_search USING fts5(
+        task_id UNINDEXED, title, body,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER dashboard_app_search_task_ai AFTER INSERT ON dashboard_app_task BEGIN
+        INSERT INTO dashboard_app_search (rowid, task_id, title, body)
+        VALUES (NEW.id * 2, NEW.id, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_app_search_task_au AFTER UPDATE OF title, description ON dashboard_app_task
+    WHEN OLD.title IS NOT NEW.title OR OLD.description IS NOT NEW.description BEGIN
+        UPDATE dashboard_app_search SET title = NEW.title, body = NEW.description WHERE rowid = NEW.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_app_search_task_ad AFTER DELETE ON dashboard_app_task BEGIN
+        DELETE FROM dashboard_app_search WHERE rowid = OLD.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_app_search_comment_ai AFTER INSERT ON dashboard_app_comment BEGIN
+        INSERT INTO dashboard_app_search (rowid, task_id, title, body)
+        VALUES (NEW.id * 2 + 1, NEW.task_id, '', NEW.content);
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_app_search_comment_au AFTER UPDATE OF content, task_id ON dashboard_app_comment
+    WHEN OLD.content IS NOT NEW.content OR OLD.task_id IS NOT NEW.task_id BEGIN
+        UPDATE dashboard_app_search SET task_id = NEW.task_id, body = NEW.content WHERE rowid = NEW.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_app_search_comment_ad AFTER DELETE ON dashboard_app_comment BEGIN
+        DELETE FROM dashboard_app_search WHERE rowid = OLD.id * 2 + 1;
+    END
+    """,
+    """
+    INSERT INTO dashboard_app_search (rowid, task_id, title, body)
+    SELECT id * 2, id, title, description FROM dashboard_app_task
+    """,
+    """
+    INSERT INTO dashboard_app_search (rowid, task_id, title, body)
+    SELECT id * 2 + 1, task_id, '', content FROM dashboard_app_comment
+    """,
+]
+
+DROP_SQL = [
+    f'DROP TRIGGER dashboard_app_search_{name}'
+    for name in ('task_ai', 'task_au', 'task_ad', 'comment_ai', 'comment_au', 'comment_ad')
+] + ['DROP TABLE dashboard_app_search']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard_app', '0019_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
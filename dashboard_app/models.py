@@ -6,6 +6,15 @@ class Board(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_boards')
     title = models.CharField(max_length=255)
     members = models.ManyToManyField(User, related_name='boards')  # Users assigned to the board
+    version = models.PositiveIntegerField(default=0, editable=False)  # Bumped on every change of the board tree
+    created_at = models.DateTimeField(auto_now_add=True)  # Timestamp when created
+    updated_at = models.DateTimeField(auto_now=True)  # Timestamp of the last change to the board or its members
+
+    # Denormalized counters, maintained by dashboard_app.signals
+    member_count = models.IntegerField(default=0, editable=False)
+    ticket_count = models.IntegerField(default=0, editable=False)
+    tasks_to_do_count = models.IntegerField(default=0, editable=False)
+    tasks_high_prio_count = models.IntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.title
@@ -31,6 +40,10 @@ class Task(models.Model):
     due_date = models.DateField()  # Due date for the task
     priority = models.CharField(max_length=15, choices=Priority.choices)  # Task priority
     status = models.CharField(max_length=15, choices=Status.choices)  # Task status
+    rank = models.CharField(max_length=64, default='', editable=False)  # Position within the status column
+    comments_count = models.IntegerField(default=0, editable=False)  # Denormalized number of comments
+    created_at = models.DateTimeField(auto_now_add=True)  # Timestamp when created
+    updated_at = models.DateTimeField(auto_now=True)  # Timestamp of the last change
 
     creator = models.ForeignKey(
         User, null=True, blank=True, on_delete=models.SET_NULL, related_name='created_tasks'
@@ -42,6 +55,16 @@ class Task(models.Model):
         User, null=True, blank=True, on_delete=models.SET_NULL, related_name='review_tasks'
     )  # Reviewer of the task
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'status'], name='task_board_status_idx'),
+            models.Index(fields=['board', 'priority'], name='task_board_priority_idx'),
+            models.Index(fields=['board', 'status', 'rank', 'id'], name='task_board_column_rank_idx'),
+            models.Index(fields=['assignee', 'due_date', 'id'], name='task_assignee_due_idx'),
+            models.Index(fields=['reviewer', 'due_date', 'id'], name='task_reviewer_due_idx'),
+            models.Index(fields=['board', 'updated_at'], name='task_board_updated_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.board.title})"
 
@@ -53,6 +76,34 @@ class Comment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)  # Author of the comment
     content = models.TextField()  # Comment text
     created_at = models.DateTimeField(auto_now_add=True)  # Timestamp when created
+    updated_at = models.DateTimeField(auto_now=True)  # Timestamp of the last change
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', '-created_at', '-id'], name='comment_task_created_idx'),
+            models.Index(fields=['task', 'updated_at'], name='comment_task_updated_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user.username} on {self.task.title}"
+
+
+class Tombstone(models.Model):
+    """A deleted task or comment, kept so clients can sync deletions."""
+
+    class Kind(models.TextChoices):
+        TASK = 'task', 'Task'
+        COMMENT = 'comment', 'Comment'
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='tombstones')  # Board the object was on
+    kind = models.CharField(max_length=15, choices=Kind.choices)  # Type of the deleted object
+    object_id = models.BigIntegerField()  # Id of the deleted object
+    deleted_at = models.DateTimeField(auto_now_add=True)  # Timestamp when deleted
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'deleted_at'], name='tombstone_board_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.kind} {self.object_id}"
@@ -0,0 +1,144 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from dashboard_app.models import Task
+from dashboard_app.versioning import bump_board_version
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+
+def rank_between(low='', high=''):
+    """Return a rank that sorts strictly between ``low`` and ``high``.
+
+    Ranks are base-36 strings compared lexicographically. An empty ``low``
+    means the start of the column and an empty ``high`` its end. Nothing
+    fits below a rank that is ``low`` followed by ``'0'``s, e.g. between
+    ``'z'`` and ``'z0'``; that raises ``ValueError`` as well.
+    """
+    if high and low >= high:
+        raise ValueError(f'No rank between {low!r} and {high!r}.')
+    if not high:
+        return rank_after(low)
+
+    result = []
+    index = 0
+    while True:
+        if high and index >= len(high):
+            raise ValueError(f'No rank between {low!r} and {high!r}.')
+        lo = DIGITS.index(low[index]) if index < len(low) else 0
+        hi = DIGITS.index(high[index]) if high else BASE
+        if hi - lo > 1:
+            result.append(DIGITS[(lo + hi) // 2])
+            return ''.join(result)
+        result.append(DIGITS[lo])
+        if hi != lo:
+            high = ''
+        index += 1
+
+
+def rank_after(low):
+    """Return a short rank that sorts after ``low``, used to append cards.
+
+    The last digit below the maximum is incremented and the tail dropped, so
+    appending grows ranks by one character only every 35 cards.
+    """
+    for index in range(len(low) - 1, -1, -1):
+        digit = DIGITS.index(low[index])
+        if digit < BASE - 1:
+            return low[:index] + DIGITS[digit + 1]
+    return low + DIGITS[1]
+
+
+def evenly_spaced_ranks(count):
+    """Return ``count`` ascending ranks of equal length spread over the key space."""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for position in range(1, count + 1):
+        value, digits = position * step, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)))
+    return ranks
+
+
+def last_ranks(columns):
+    """Return the highest rank of each ``(board_id, status)`` column."""
+    board_ids = {board_id for board_id, _ in columns}
+    statuses = {status for _, status in columns}
+    rows = (
+        Task.objects.filter(board_id__in=board_ids, status__in=statuses)
+        .values_list('board_id', 'status')
+        .annotate(last=Max('rank'))
+    )
+    return {(board_id, status): last or '' for board_id, status, last in rows}
+
+
+def needs_rebalance(rank):
+    """Return True once a rank grew past ``TASK_RANK_MAX_LENGTH``."""
+    return len(rank) > getattr(settings, 'TASK_RANK_MAX_LENGTH', 24)
+
+
+def rebalance_column(board_id, status):
+    """Rewrite the ranks of one column evenly, keeping the current order."""
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(board_id=board_id, status=status)
+            .order_by('rank', 'id')
+            .only('id', 'rank', 'updated_at')
+        )
+        now = timezone.now()
+        for task, rank in zip(tasks, evenly_spaced_ranks(len(tasks))):
+            task.rank = rank
+            task.updated_at = now
+        Task.objects.bulk_update(tasks, ['rank', 'updated_at'], batch_size=500)
+        bump_board_version(board_id)
+
+
+def move_task(task, status, before=None, after=None):
+    """Place ``task`` in the ``status`` column between two neighbours.
+
+    ``after`` is the card the task should follow and ``before`` the card it
+    should precede; either may be omitted. Only the moved row is written.
+    If the neighbours leave no room the column is rebalanced first; if the
+    new rank gets too long it is rebalanced after commit.
+    """
+    if before is not None and after is not None and (after.rank, after.id) >= (before.rank, before.id):
+        raise ValueError('The "after" card must come before the "before" card.')
+
+    column = Task.objects.filter(board_id=task.board_id, status=status).exclude(pk=task.pk)
+    if after is not None and before is None:
+        before = (
+            column.filter(Q(rank__gt=after.rank) | Q(rank=after.rank, id__gt=after.id))
+            .order_by('rank', 'id').first()
+        )
+    elif before is not None and after is None:
+        after = (
+            column.filter(Q(rank__lt=before.rank) | Q(rank=before.rank, id__lt=before.id))
+            .order_by('-rank', '-id').first()
+        )
+    elif before is None and after is None:
+        after = column.order_by('-rank', '-id').first()
+
+    low = after.rank if after else ''
+    high = before.rank if before else ''
+    try:
+        rank = rank_between(low, high)
+    except ValueError:
+        rebalance_column(task.board_id, status)
+        before, after = (Task.objects.get(pk=card.pk) if card else None for card in (before, after))
+        return move_task(task, status, before=before, after=after)
+
+    task.status = status
+    task.rank = rank
+    task.save(update_fields=['status', 'rank', 'updated_at'])
+    if needs_rebalance(task.rank):
+        transaction.on_commit(lambda: rebalance_column(task.board_id, status))
+    return task
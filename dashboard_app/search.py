@@ -0,0 +1,98 @@
+import html
+import re
+
+from django.db import connection, transaction
+
+SEARCH_TABLE = 'dashboard_app_search'
+
+# Weights of the task_id, title and body columns in the bm25() ranking.
+COLUMN_WEIGHTS = (0.0, 10.0, 1.0)
+
+# Control characters mark the hits in snippets so the text can be escaped
+# before they become <mark> tags.
+_MARK_START, _MARK_END = '\x02', '\x03'
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match_query(text):
+    """Turn user input into an FTS5 query matching all words.
+
+    Every word is quoted, so FTS5 operators in the input have no effect,
+    and the last word matches as a prefix for search-as-you-type.
+    """
+    words = _TOKEN.findall(text or '')
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _snippet(raw):
+    escaped = html.escape(raw or '')
+    return escaped.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def search(match, board_ids, limit, after=None):
+    """Return up to ``limit`` ranked hits in ``board_ids`` after a position.
+
+    Hits are ordered by ``(score, rowid)``; ``after`` is such a pair from
+    the previous page. Each hit is a dict with the kind, ids, task title,
+    snippet and score.
+    """
+    board_ids = list(board_ids)
+    if not board_ids:
+        return []
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    placeholders = ', '.join(['%s'] * len(board_ids))
+    params = [_MARK_START, _MARK_END, match, *board_ids]
+    sql = f"""
+        SELECT * FROM (
+            SELECT s.rowid AS rowid, t.id AS task_id, t.board_id, t.title,
+                   snippet({SEARCH_TABLE}, -1, %s, %s, '…', 16) AS snippet,
+                   bm25({SEARCH_TABLE}, {weights}) AS score
+            FROM {SEARCH_TABLE} s
+            JOIN dashboard_app_task t ON t.id = s.task_id
+            WHERE {SEARCH_TABLE} MATCH %s AND t.board_id IN ({placeholders})
+        )
+    """
+    if after is not None:
+        sql += ' WHERE score > %s OR (score = %s AND rowid > %s)'
+        params += [after[0], after[0], after[1]]
+    sql += ' ORDER BY score, rowid LIMIT %s'
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        {
+            'type': 'comment' if rowid % 2 else 'task',
+            'id': rowid // 2,
+            'task_id': task_id,
+            'board_id': board_id,
+            'task_title': title,
+            'snippet': _snippet(snippet),
+            'score': score,
+            'rowid': rowid,
+        }
+        for rowid, task_id, board_id, title, snippet, score in rows
+    ]
+
+
+def rebuild_index():
+    """Refill the search table from the task and comment tables."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, task_id, title, body) '
+            'SELECT id * 2, id, title, description FROM dashboard_app_task'
+        )
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, task_id, title, body) "
+            "SELECT id * 2 + 1, task_id, '', content FROM dashboard_app_comment"
+        )
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT count(*) FROM {SEARCH_TABLE}')
+        return cursor.fetchone()[0]
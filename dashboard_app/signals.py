@@ -0,0 +1,168 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from dashboard_app.counters import BoardChanges, change_comment_count, refresh_member_counts
+from dashboard_app.events import publish_board_event
+from dashboard_app.membership import invalidate_board_access
+from dashboard_app.models import Board, Task, Comment, Tombstone
+from dashboard_app.ranking import last_ranks, rank_between
+from dashboard_app.sync import record_tombstones, touch_moved_comments
+from dashboard_app.versioning import bump_board_version
+
+
+def origin_model(origin):
+    """Return the model of the instance or queryset a delete started at."""
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+def deleted_board_ids(origin):
+    """Return ids of the boards removed by the delete that started at ``origin``.
+
+    ``origin`` is the instance or queryset ``delete()`` was called on; the
+    Board ``pre_delete`` handler records the boards of its cascade on it.
+    The ids live on that object rather than the thread, so a delete that
+    fails leaves nothing behind for other deletes.
+    """
+    return getattr(origin, '_deleted_board_ids', frozenset())
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def board_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate board access of users added to or removed from a board."""
+    if action == 'pre_clear':
+        if reverse:
+            instance._cleared_user_ids = [instance.pk]
+            instance._cleared_board_ids = list(instance.boards.values_list('id', flat=True))
+        else:
+            instance._cleared_user_ids = list(instance.members.values_list('id', flat=True))
+    elif action == 'post_clear':
+        invalidate_board_access(*getattr(instance, '_cleared_user_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_board_access(*([instance.pk] if reverse else pk_set))
+
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            board_ids = [instance.pk]
+        elif action == 'post_clear':
+            board_ids = getattr(instance, '_cleared_board_ids', [])
+        else:
+            board_ids = pk_set or []
+        refresh_member_counts(*board_ids)
+        for board_id in board_ids:
+            publish_board_event(board_id, 'members.changed')
+
+
+@receiver(post_init, sender=Board)
+def remember_board_owner(sender, instance, **kwargs):
+    """Keep the loaded owner so an ownership change can be detected on save."""
+    instance._loaded_owner_id = instance.__dict__.get('owner_id')
+
+
+@receiver(post_save, sender=Board)
+def board_owner_changed(sender, instance, created, **kwargs):
+    """Invalidate board access of the previous and the new owner."""
+    if created or instance._loaded_owner_id != instance.owner_id:
+        invalidate_board_access(instance._loaded_owner_id, instance.owner_id)
+    instance._loaded_owner_id = instance.owner_id
+    if not created:
+        bump_board_version(instance.pk)
+        instance.refresh_from_db(fields=['version'])
+        publish_board_event(instance.pk, 'board.updated', instance.pk)
+
+
+@receiver(pre_delete, sender=Board)
+def board_deleted(sender, instance, origin=None, **kwargs):
+    """Invalidate board access of everyone who could reach a deleted board."""
+    member_ids = list(instance.members.values_list('id', flat=True))
+    invalidate_board_access(instance.owner_id, *member_ids)
+    publish_board_event(instance.pk, 'board.deleted', instance.pk)
+    if origin is not None:
+        origin.__dict__.setdefault('_deleted_board_ids', set()).add(instance.pk)
+
+
+@receiver(post_init, sender=Task)
+def remember_task_board(sender, instance, **kwargs):
+    """Keep the loaded state so column moves and counter changes are detected."""
+    instance._loaded_board_id = instance.__dict__.get('board_id')
+    instance._loaded_status = instance.__dict__.get('status')
+    instance._loaded_priority = instance.__dict__.get('priority')
+
+
+@receiver(pre_save, sender=Task)
+def rank_task(sender, instance, update_fields=None, **kwargs):
+    """Append new tasks and tasks that changed column to the end of the column."""
+    if update_fields is not None:
+        return
+    moved = (instance._loaded_board_id, instance._loaded_status) != (instance.board_id, instance.status)
+    if instance.rank and not moved:
+        return
+    column = (instance.board_id, instance.status)
+    instance.rank = rank_between(last_ranks([column]).get(column, ''), '')
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    """Update the counters and version of the board (or boards) of the task."""
+    changes = BoardChanges()
+    new = (instance.board_id, instance.status, instance.priority)
+    if created:
+        changes.add_task(*new)
+    else:
+        changes.move_task((instance._loaded_board_id, instance._loaded_status, instance._loaded_priority), new)
+    changes.bump(instance._loaded_board_id)
+    changes.bump(instance.board_id)
+    changes.apply()
+
+    if instance._loaded_board_id not in (None, instance.board_id):
+        record_tombstones(Tombstone.Kind.TASK, [(instance._loaded_board_id, instance.pk)])
+        touch_moved_comments([instance.pk])
+        publish_board_event(instance._loaded_board_id, 'task.deleted', instance.pk)
+    publish_board_event(instance.board_id, 'task.created' if created else 'task.updated', instance.pk)
+    instance._loaded_board_id = instance.board_id
+    instance._loaded_status = instance.status
+    instance._loaded_priority = instance.priority
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    """Update the board counters unless the whole board is being deleted."""
+    if instance.board_id in deleted_board_ids(origin):
+        return
+    changes = BoardChanges()
+    changes.add_task(instance.board_id, instance.status, instance.priority, sign=-1)
+    changes.bump(instance.board_id)
+    changes.apply()
+    record_tombstones(Tombstone.Kind.TASK, [(instance.board_id, instance.pk)])
+    publish_board_event(instance.board_id, 'task.deleted', instance.pk)
+
+
+def comment_board_id(comment):
+    """Return the board of a comment, using the loaded task when there is one."""
+    if Comment.task.is_cached(comment):
+        return comment.task.board_id
+    return Task.objects.filter(pk=comment.task_id).values_list('board_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    """Count a new comment and bump the version of its board."""
+    if created:
+        change_comment_count(instance.task_id, 1)
+    board_id = comment_board_id(instance)
+    bump_board_version(board_id)
+    publish_board_event(board_id, 'comment.created' if created else 'comment.updated', instance.pk)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    """Uncount a comment unless its task or board is being deleted."""
+    if origin_model(origin) in (Task, Board):
+        return
+    board_id = comment_board_id(instance)
+    if board_id is None or board_id in deleted_board_ids(origin):
+        return
+    change_comment_count(instance.task_id, -1)
+    bump_board_version(board_id)
+    record_tombstones(Tombstone.Kind.COMMENT, [(board_id, instance.pk)])
+    publish_board_event(board_id, 'comment.deleted', instance.pk)
@@ -0,0 +1,55 @@
+import base64
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from dashboard_app.models import Comment, Tombstone
+
+
+def make_sync_token(moment):
+    """Encode a point in time as an opaque sync token."""
+    micros = int(moment.timestamp() * 1_000_000)
+    return base64.urlsafe_b64encode(str(micros).encode()).decode().rstrip('=')
+
+
+def parse_sync_token(token):
+    """Decode a sync token, raising ValueError if it is malformed."""
+    raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    micros = int(raw.decode())
+    return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
+
+
+def next_sync_token():
+    """Return the token for rows changed from now on.
+
+    The token lies ``SYNC_TOKEN_OVERLAP`` seconds in the past so that rows
+    written by transactions still in flight are not skipped; clients apply
+    changes idempotently, so the overlap only costs a few repeated rows.
+    """
+    overlap = getattr(settings, 'SYNC_TOKEN_OVERLAP', 2)
+    return make_sync_token(timezone.now() - timedelta(seconds=overlap))
+
+
+def tombstone_retention():
+    """Return how long tombstones are kept before a client must resync."""
+    return timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+
+def record_tombstones(kind, board_object_ids):
+    """Store tombstones for ``(board_id, object_id)`` pairs in one query."""
+    Tombstone.objects.bulk_create([
+        Tombstone(board_id=board_id, kind=kind, object_id=object_id)
+        for board_id, object_id in board_object_ids
+        if board_id is not None
+    ])
+
+
+def touch_moved_comments(task_ids):
+    """Mark the comments of tasks that changed board as updated.
+
+    Delta syncs of the new board pick comments by ``updated_at``, so
+    without this the comments of a moved task would only arrive on a reset.
+    """
+    if task_ids:
+        Comment.objects.filter(task_id__in=task_ids).update(updated_at=timezone.now())
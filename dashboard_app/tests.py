@@ -1,3 +1,1211 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import json
+import re
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from dashboard_app.api.filters import TaskFilterBackend
+from dashboard_app.events import get_broker
+from dashboard_app.membership import accessible_board_ids
+from dashboard_app.models import Board, Task, Comment
+
+
+# Test data is uncommitted, so it cannot be read through a configured replica;
+# only ReplicaRoutingTests uses the router.
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'], DATABASE_ROUTERS=[])
+class DashboardTestCase(TestCase):
+    """Shared fixture: two users sharing a few boards full of tasks."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'pw', first_name='Anna', last_name='Lee')
+        self.other = User.objects.create_user('ben', 'ben@example.com', 'pw', first_name='Ben', last_name='Ray')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.boards = []
+        for i in range(3):
+            board = Board.objects.create(owner=self.user if i % 2 else self.other, title=f'Board {i}')
+            board.members.add(self.user, self.other)
+            for j in range(4):
+                task = Task.objects.create(
+                    board=board, title=f'Task {j}', due_date='2025-01-0%d' % (j + 1),
+                    priority=Task.Priority.HIGH if j % 2 else Task.Priority.LOW,
+                    status=Task.Status.TODO if j < 3 else Task.Status.DONE,
+                    assignee=self.user, reviewer=self.other,
+                )
+                Comment.objects.create(task=task, user=self.user, content='Looks good')
+            self.boards.append(board)
+        self.foreign_board = Board.objects.create(owner=self.other, title='Foreign')
+
+
+class BoardListViewTests(DashboardTestCase):
+
+    def test_list_is_scoped_and_uses_one_query(self):
+        self.client.get('/api/boards/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/boards/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([b['id'] for b in response.json()], [b.id for b in self.boards])
+        self.assertEqual(response.json()[0], {
+            'id': self.boards[0].id,
+            'member_count': 2,
+            'ticket_count': 4,
+            'tasks_to_do_count': 3,
+            'tasks_high_prio_count': 2,
+            'owner_id': self.other.id,
+            'title': 'Board 0',
+        })
+
+    def test_create_returns_counters(self):
+        response = self.client.post('/api/boards/', {'title': 'New', 'members': [self.other.id]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['member_count'], 1)
+        self.assertEqual(response.json()['owner_id'], self.user.id)
+
+
+class BoardDetailViewTests(DashboardTestCase):
+
+    def test_detail_query_count_does_not_grow_with_tasks(self):
+        board = self.boards[0]
+        accessible_board_ids(self.user)
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/boards/{board.id}/')
+        self.assertEqual(response.status_code, 200)
+        tasks = response.json()['tasks']
+        self.assertEqual(len(tasks), 4)
+        self.assertEqual(tasks[0]['comments_count'], 1)
+        self.assertEqual(tasks[0]['assignee']['fullname'], 'Anna Lee')
+        self.assertEqual(len(response.json()['members']), 2)
+
+        for j in range(10):
+            Task.objects.create(
+                board=board, title=f'Extra {j}', due_date='2025-02-01',
+                priority=Task.Priority.LOW, status=Task.Status.TODO, assignee=self.other,
+            )
+        with self.assertNumQueries(4):
+            self.client.get(f'/api/boards/{board.id}/')
+
+    def test_update_validates_members_in_one_query(self):
+        board = self.boards[0]
+        extra = [User.objects.create_user(f'u{i}', f'u{i}@example.com', 'pw') for i in range(5)]
+        member_ids = [self.user.id] + [u.id for u in extra]
+        accessible_board_ids(self.user)
+        with self.assertNumQueries(12):
+            response = self.client.patch(f'/api/boards/{board.id}/', {'members': member_ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(m['id'] for m in response.json()['members_data']), sorted(member_ids))
+
+    def test_update_rejects_unknown_member(self):
+        response = self.client.patch(f'/api/boards/{self.boards[0].id}/', {'members': [9999]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class MembershipTests(DashboardTestCase):
+
+    def test_member_changes_are_applied(self):
+        board = self.boards[0]
+        task = board.tasks.first()
+        self.assertEqual(self.client.get(f'/api/tasks/{task.id}/comments/').status_code, 200)
+
+        board.members.remove(self.user)
+        self.assertEqual(self.client.get(f'/api/tasks/{task.id}/comments/').status_code, 403)
+
+        self.user.boards.add(board)
+        self.assertEqual(self.client.get(f'/api/tasks/{task.id}/comments/').status_code, 200)
+
+        board.members.clear()
+        self.assertEqual(self.client.get(f'/api/tasks/{task.id}/comments/').status_code, 403)
+
+    def test_owner_change_is_applied(self):
+        board = self.foreign_board
+        self.assertEqual(self.client.get(f'/api/boards/{board.id}/').status_code, 403)
+        board.owner = self.user
+        board.save()
+        self.assertEqual(self.client.get(f'/api/boards/{board.id}/').status_code, 200)
+
+    def test_non_member_cannot_create_task(self):
+        response = self.client.post('/api/tasks/', {
+            'board': self.foreign_board.id, 'title': 'x', 'due_date': '2025-01-01',
+            'priority': 'low', 'status': 'to-do', 'assignee_id': self.user.id, 'reviewer_id': self.user.id,
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class ETagTests(DashboardTestCase):
+
+    def test_unchanged_board_returns_304_without_loading_tasks(self):
+        url = f'/api/boards/{self.boards[0].id}/'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_changes_in_the_board_tree_change_the_etag(self):
+        board = self.boards[0]
+        url = f'/api/boards/{board.id}/'
+        first = self.client.get(url)['ETag']
+        etags = {first}
+
+        task = board.tasks.first()
+        task.status = Task.Status.DONE
+        task.save()
+        etags.add(self.client.get(url)['ETag'])
+
+        Comment.objects.create(task=task, user=self.user, content='Done')
+        etags.add(self.client.get(url)['ETag'])
+
+        board.members.remove(self.other)
+        etags.add(self.client.get(url)['ETag'])
+
+        board.title = 'Renamed'
+        board.save()
+        board.save()
+        etags.add(self.client.get(url)['ETag'])
+        self.assertEqual(len(etags), 5)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first).status_code, 200)
+
+    def test_comment_list_etag(self):
+        task = self.boards[1].tasks.first()
+        url = f'/api/tasks/{task.id}/comments/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Comment.objects.create(task=task, user=self.user, content='Another')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_foreign_board_is_not_disclosed(self):
+        response = self.client.get(f'/api/boards/{self.foreign_board.id}/', HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, 403)
+
+
+class CursorPaginationTests(DashboardTestCase):
+
+    def collect(self, url):
+        """Follow next links and return all ids and the number of pages."""
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.json()['results']]
+            url = response.json()['next']
+            pages += 1
+        return ids, pages
+
+    def test_tasks_are_paged_by_due_date_and_id(self):
+        ids, pages = self.collect('/api/tasks/assigned-to-me/?page_size=5')
+        expected = list(Task.objects.filter(assignee=self.user).order_by('due_date', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_comments_are_paged_newest_first(self):
+        task = Task.objects.filter(board=self.boards[0]).first()
+        for i in range(4):
+            Comment.objects.create(task=task, user=self.other, content=f'Reply {i}')
+        ids, pages = self.collect(f'/api/tasks/{task.id}/comments/?page_size=2')
+        expected = list(task.comments.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_unpaginated_requests_return_plain_list(self):
+        response = self.client.get('/api/tasks/reviewing/')
+        self.assertIsInstance(json.loads(b''.join(response.streaming_content)), list)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/tasks/assigned-to-me/?cursor=garbage')
+        self.assertEqual(response.status_code, 404)
+
+
+class QueryPlanTests(DashboardTestCase):
+    """EXPLAIN the endpoint querysets and check they search an index."""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertRegex(plan, rf'USING (COVERING )?INDEX {index_name}\b', plan)
+
+    def test_board_column_filters(self):
+        board = self.boards[0]
+        self.assertUsesIndex(Task.objects.filter(board=board, status=Task.Status.TODO), 'task_board_status_idx')
+        self.assertUsesIndex(Task.objects.filter(board=board, priority=Task.Priority.HIGH), 'task_board_priority_idx')
+
+    def test_assigned_and_reviewing_lists(self):
+        assigned = Task.objects.filter(assignee=self.user).order_by('due_date', 'id')
+        reviewing = Task.objects.filter(reviewer=self.user).order_by('due_date', 'id')
+        self.assertUsesIndex(assigned, 'task_assignee_due_idx')
+        self.assertUsesIndex(reviewing, 'task_reviewer_due_idx')
+        self.assertNotIn('TEMP B-TREE', assigned.explain())
+
+    def test_comment_list(self):
+        task = Task.objects.first()
+        comments = Comment.objects.filter(task=task).order_by('-created_at', '-id')
+        self.assertUsesIndex(comments, 'comment_task_created_idx')
+        self.assertNotIn('TEMP B-TREE', comments.explain())
+
+
+class TaskFilterTests(DashboardTestCase):
+
+    def ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in json.loads(b''.join(response.streaming_content))]
+
+    def expected(self, order=('due_date', 'id'), **filters):
+        return list(Task.objects.filter(**filters).order_by(*order).values_list('id', flat=True))
+
+    def test_filters_are_combined(self):
+        board = self.boards[0]
+        self.assertEqual(
+            self.ids(f'/api/tasks/assigned-to-me/?board={board.id}&status=to-do&priority=high'),
+            self.expected(board=board, status='to-do', priority='high'),
+        )
+
+    def test_comma_lists_and_date_range(self):
+        boards = self.boards[:2]
+        url = f'/api/tasks/assigned-to-me/?board={boards[0].id},{boards[1].id}&due_date__gte=2025-01-02&due_date__lte=2025-01-03'
+        self.assertEqual(
+            self.ids(url),
+            self.expected(board__in=boards, due_date__range=('2025-01-02', '2025-01-03')),
+        )
+        self.assertEqual(
+            self.ids(f'/api/tasks/assigned-to-me/?status=done,review&assignee={self.user.id}'),
+            self.expected(status__in=['done', 'review'], assignee=self.user),
+        )
+
+    def test_ordering(self):
+        self.assertEqual(
+            self.ids('/api/tasks/assigned-to-me/?ordering=-due_date'),
+            self.expected(order=('-due_date', '-id'), assignee=self.user),
+        )
+
+    def test_ordering_is_kept_across_pages(self):
+        url, ids = '/api/tasks/assigned-to-me/?ordering=-created_at&page_size=5', []
+        while url:
+            response = self.client.get(url).json()
+            ids += [row['id'] for row in response['results']]
+            url = response['next']
+        self.assertEqual(ids, self.expected(order=('-created_at', '-id'), assignee=self.user))
+
+    def test_invalid_values_are_rejected(self):
+        for query in ('status=later', 'priority=high,urgent', 'board=abc', 'due_date__lte=soon', 'ordering=title'):
+            response = self.client.get(f'/api/tasks/assigned-to-me/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn(query.split('=')[0], response.json())
+
+    def test_filters_use_composite_indexes(self):
+        def plan(queryset, query):
+            request = Request(APIRequestFactory().get('/', query))
+            return TaskFilterBackend().filter_queryset(request, queryset, None).explain()
+
+        board_plan = plan(Task.objects.order_by('due_date', 'id'), {'board': self.boards[0].id, 'status': 'to-do'})
+        self.assertRegex(board_plan, r'INDEX (task_board_status_idx|task_board_column_rank_idx)\b')
+        assigned_plan = plan(Task.objects.filter(assignee=self.user), {'due_date__lte': '2025-01-02', 'ordering': '-due_date'})
+        self.assertRegex(assigned_plan, r'INDEX task_assignee_due_idx\b')
+        self.assertNotIn('TEMP B-TREE', assigned_plan)
+
+
+@mock.patch('dashboard_app.agenda.timezone.localdate', return_value=datetime.date(2025, 1, 2))
+class AgendaTests(DashboardTestCase):
+
+    def test_buckets_and_counts(self, localdate):
+        Task.objects.create(
+            board=self.foreign_board, title='Hidden', due_date='2025-03-01',
+            priority=Task.Priority.HIGH, status=Task.Status.TODO,
+        )
+        accessible_board_ids(self.user)
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/agenda/')
+        self.assertEqual(response.status_code, 200)
+        agenda = response.json()
+        self.assertEqual(agenda['date'], '2025-01-02')
+        self.assertEqual(agenda['urgent_count'], 3)
+        counts = {name: (bucket['count'], bucket['urgent_count']) for name, bucket in agenda['buckets'].items()}
+        self.assertEqual(counts, {'overdue': (3, 0), 'today': (3, 3), 'this_week': (3, 0), 'later': (0, 0)})
+        self.assertEqual(
+            [task['id'] for task in agenda['buckets']['today']['tasks']],
+            list(Task.objects.filter(board__in=self.boards, due_date='2025-01-02').order_by('id').values_list('id', flat=True)),
+        )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/agenda/').json(), agenda)
+
+    def test_task_changes_invalidate_the_agenda(self, localdate):
+        self.client.get('/api/agenda/')
+        task = Task.objects.filter(board=self.boards[0], due_date='2025-01-01').get()
+        task.due_date = '2025-01-20'
+        task.save()
+        buckets = self.client.get('/api/agenda/').json()['buckets']
+        self.assertEqual(buckets['overdue']['count'], 2)
+        self.assertEqual([t['id'] for t in buckets['later']['tasks']], [task.id])
+
+    @override_settings(AGENDA_BUCKET_SIZE=2)
+    def test_bucket_tasks_are_bounded(self, localdate):
+        bucket = self.client.get('/api/agenda/').json()['buckets']['overdue']
+        self.assertEqual(bucket['count'], 3)
+        self.assertEqual(len(bucket['tasks']), 2)
+
+
+class BoardTransferTests(DashboardTestCase):
+
+    def export(self, board, fmt='ndjson'):
+        response = self.client.get(f'/api/boards/{board.id}/export.{fmt}')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def snapshot(self, board):
+        """Return the board content with users by email and without ids."""
+        tasks = board.tasks.order_by('id')
+        return (
+            board.title,
+            sorted(board.members.values_list('email', flat=True)),
+            list(tasks.values_list('title', 'due_date', 'priority', 'status', 'rank', 'assignee__email', 'reviewer__email')),
+            list(Comment.objects.filter(task__board=board).order_by('id').values_list('task__title', 'user__email', 'content')),
+        )
+
+    @override_settings(BOARD_TRANSFER_CHUNK_SIZE=3)
+    def test_round_trip(self):
+        board = Board.objects.get(pk=self.boards[0].pk)
+        for fmt, content_type in (('ndjson', 'application/x-ndjson'), ('csv', 'text/csv')):
+            with self.subTest(fmt):
+                response = self.client.post('/api/boards/import/', self.export(board, fmt), content_type=content_type)
+                self.assertEqual(response.status_code, 201, response.content)
+                self.assertEqual(response.json()['tasks'], 4)
+                self.assertEqual(response.json()['comments'], 4)
+                copy = Board.objects.get(pk=response.json()['id'])
+                self.assertEqual(copy.owner, self.user)
+                self.assertEqual(self.snapshot(copy), self.snapshot(board))
+                self.assertEqual(
+                    (copy.member_count, copy.ticket_count, copy.tasks_to_do_count, copy.tasks_high_prio_count),
+                    (board.member_count, board.ticket_count, board.tasks_to_do_count, board.tasks_high_prio_count),
+                )
+                self.assertEqual(sorted(copy.tasks.values_list('comments_count', flat=True)), [1, 1, 1, 1])
+
+    def test_export_reads_in_chunks(self):
+        lines = self.export(self.boards[0]).decode().splitlines()
+        self.assertEqual([json.loads(line)['type'] for line in lines], ['board'] + ['task'] * 4 + ['comment'] * 4)
+        self.assertEqual(json.loads(lines[1])['assignee'], 'anna@example.com')
+        self.assertEqual(self.client.get(f'/api/boards/{self.foreign_board.id}/export.csv').status_code, 403)
+        self.assertEqual(self.client.get(f'/api/boards/{self.boards[0].id}/export.xml').status_code, 404)
+
+    def test_unknown_users_and_bad_records(self):
+        stream = '\n'.join(json.dumps(record) for record in [
+            {'type': 'board', 'title': 'Moved', 'members': ['ben@example.com', 'gone@example.com']},
+            {'type': 'task', 'id': 7, 'title': 'T', 'due_date': '2025-01-01', 'priority': 'low',
+             'status': 'to-do', 'assignee': 'gone@example.com'},
+            {'type': 'comment', 'task': 7, 'user': 'GONE@example.com', 'content': 'Hi'},
+        ])
+        response = self.client.post('/api/boards/import/', stream, content_type='application/x-ndjson')
+        self.assertEqual(response.json()['unknown_users'], ['gone@example.com'])
+        board = Board.objects.get(pk=response.json()['id'])
+        self.assertEqual(list(board.members.all()), [self.other])
+        self.assertIsNone(board.tasks.get().assignee)
+        self.assertEqual(Comment.objects.get(task__board=board).user, self.user)
+
+        boards = Board.objects.count()
+        bad = stream.replace('"low"', '"urgent"')
+        response = self.client.post('/api/boards/import/', bad, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('priority', response.json()['detail'])
+        self.assertEqual(Board.objects.count(), boards)
+
+    def test_superusers_are_not_imported_as_members(self):
+        User.objects.create_superuser('root', 'root@example.com', 'pw')
+        stream = json.dumps({'type': 'board', 'title': 'Admins', 'members': ['root@example.com', 'ben@example.com']})
+        response = self.client.post('/api/boards/import/', stream, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201, response.content)
+        board = Board.objects.get(pk=response.json()['id'])
+        self.assertEqual(list(board.members.all()), [self.other])
+        self.assertEqual(board.member_count, 1)
+
+    def test_invalid_ranks_are_replaced(self):
+        records = [{'type': 'board', 'title': 'Ranks', 'members': [self.user.email]}] + [
+            {'type': 'task', 'title': f'T{i}', 'due_date': '2025-01-01', 'priority': 'low', 'status': 'to-do', 'rank': rank,
+             'creator': self.user.email}
+            for i, rank in enumerate([5, 'ZZ!', 'm', None, 'x' * 65, '0', 'x0'])
+        ]
+        stream = '\n'.join(json.dumps(record) for record in records)
+        response = self.client.post('/api/boards/import/', stream, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201, response.content)
+        tasks = list(Task.objects.filter(board_id=response.json()['id']).order_by('id').values_list('id', 'rank'))
+        ranks = [rank for _, rank in tasks]
+        self.assertEqual(ranks[2], 'm')
+        self.assertTrue(all(re.fullmatch('[0-9a-z]{0,63}[1-9a-z]', rank) for rank in ranks), ranks)
+        self.assertLess(ranks[2], ranks[3])
+
+        first, last = min(tasks, key=lambda task: task[1])[0], tasks[-1][0]
+        response = self.client.post(f'/api/tasks/{last}/move/', {'before': first}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Task.objects.filter(board_id=response.json()['board']).order_by('rank').first().id, last)
+
+    def test_commands(self):
+        path = self.enterContext(tempfile.TemporaryDirectory()) + '/board.csv'
+        call_command('export_board', self.boards[1].id, format='csv', output=path, stderr=StringIO())
+        out = StringIO()
+        call_command('import_board', path, owner='BEN@example.com', batch_size=2, stdout=out, stderr=StringIO())
+        self.assertIn('4 task(s) and 4 comment(s)', out.getvalue())
+        copy = Board.objects.latest('id')
+        self.assertEqual(copy.owner, self.other)
+        self.assertEqual(self.snapshot(copy), self.snapshot(self.boards[1]))
+
+
+class AsyncReadViewTests(DashboardTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.token = Token.objects.create(user=self.user)
+        self.task = Task.objects.filter(board=self.boards[0]).first()
+
+    def body(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def async_get(self, url, token=True, **headers):
+        if token:
+            headers['Authorization'] = f'Token {self.token.key}'
+
+        async def fetch():
+            response = await AsyncClient().get(url, headers=headers)
+            if response.streaming:
+                return response, b''.join([chunk async for chunk in response.streaming_content])
+            return response, response.content
+        return async_to_sync(fetch)()
+
+    def test_responses_match_sync_views(self):
+        paths = [
+            '/api/boards/{}',
+            f'/api/boards/{self.boards[1].id}/{{}}',
+            '/api/tasks/{}',
+            '/api/tasks/{}?page_size=5',
+            '/api/tasks/assigned-to-me/{}?status=to-do,done&ordering=-due_date',
+            '/api/tasks/reviewing/{}',
+            f'/api/tasks/{self.task.id}/comments/{{}}',
+        ]
+        Comment.objects.create(task=self.task, user=self.other, content='Second')
+        for path in paths:
+            with self.subTest(path):
+                sync = self.client.get(path.format(''))
+                response, body = self.async_get(path.format('async/'))
+                self.assertEqual(response.status_code, 200)
+                # Next links point back at the async view.
+                self.assertEqual(json.loads(body.replace(b'async/', b'')), json.loads(self.body(sync)))
+
+    def test_errors(self):
+        self.assertEqual(self.async_get('/api/boards/async/', token=False)[0].status_code, 401)
+        response, body = self.async_get('/api/boards/async/', token=False, Authorization='Token nope')
+        self.assertEqual((response.status_code, response['WWW-Authenticate']), (401, 'Token'))
+        self.assertEqual(json.loads(body), {'detail': 'Invalid token.'})
+        self.assertEqual(self.async_get(f'/api/boards/{self.foreign_board.id}/async/')[0].status_code, 403)
+        self.assertEqual(self.async_get('/api/boards/9999/async/')[0].status_code, 404)
+        self.assertEqual(self.async_get('/api/tasks/9999/comments/async/')[0].status_code, 404)
+        response, body = self.async_get('/api/tasks/async/?priority=urgent')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('priority', json.loads(body))
+
+    def test_conditional_get(self):
+        response, _ = self.async_get(f'/api/boards/{self.boards[0].id}/async/')
+        response, body = self.async_get(f'/api/boards/{self.boards[0].id}/async/', If_None_Match=response['ETag'])
+        self.assertEqual((response.status_code, body), (304, b''))
+
+    def test_token_and_access_are_cached(self):
+        self.async_get('/api/boards/async/')
+        with self.assertNumQueries(1):
+            self.async_get('/api/boards/async/')
+
+
+class TaskBulkViewTests(DashboardTestCase):
+
+    def item(self, **kwargs):
+        return {
+            'board': self.boards[0].id, 'title': 'Imported', 'due_date': '2025-03-01',
+            'priority': 'medium', 'status': 'to-do',
+            'assignee_id': self.user.id, 'reviewer_id': self.other.id, **kwargs,
+        }
+
+    def test_query_count_does_not_grow_with_items(self):
+        accessible_board_ids(self.user)
+        with self.assertNumQueries(7):
+            response = self.client.post('/api/tasks/bulk/', [self.item() for _ in range(3)], format='json')
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(7):
+            response = self.client.post('/api/tasks/bulk/', [self.item() for _ in range(30)], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.boards[0].tasks.count(), 4 + 33)
+
+    def test_duplicate_ids_are_rejected(self):
+        board = self.boards[0]
+        task = board.tasks.get(due_date='2025-01-01')
+        response = self.client.post('/api/tasks/bulk/', [
+            {'id': task.id, 'status': 'done'},
+            {'id': task.id, 'title': 'x'},
+        ], format='json')
+        results = response.json()['results']
+        self.assertEqual(results[0]['status'], 'updated')
+        self.assertEqual(results[1], {'status': 'error', 'errors': {'id': ['Duplicate task in request.']}})
+        board.refresh_from_db()
+        self.assertEqual(board.tasks_to_do_count, board.tasks.filter(status='to-do').count())
+        self.assertEqual(board.tasks_to_do_count, 2)
+
+    def test_update_and_move(self):
+        tasks = list(self.boards[1].tasks.order_by('id')[:2])
+        comment = tasks[1].comments.get()
+        response = self.client.post('/api/tasks/bulk/', [
+            {'id': tasks[0].id, 'status': 'done'},
+            {'id': tasks[1].id, 'board': self.boards[2].id, 'title': 'Moved'},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['task']['status'], 'done')
+        self.assertEqual(response.json()['results'][0]['task']['comments_count'], 1)
+        tasks[1].refresh_from_db()
+        self.assertEqual((tasks[1].board_id, tasks[1].title), (self.boards[2].id, 'Moved'))
+        # The moved task's comments are picked up by delta syncs of the new board.
+        self.assertGreater(Comment.objects.get(pk=comment.pk).updated_at, comment.updated_at)
+
+    def test_errors_are_reported_per_item(self):
+        response = self.client.post('/api/tasks/bulk/', [
+            self.item(),
+            self.item(board=self.foreign_board.id),
+            self.item(assignee_id=9999),
+            {'id': 9999, 'status': 'done'},
+            self.item(priority='urgent'),
+        ], format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([r['status'] for r in response.json()['results']], ['created'] + ['error'] * 4)
+        self.assertIn('assignee_id', response.json()['results'][2]['errors'])
+        self.assertEqual(Task.objects.filter(title='Imported').count(), 1)
+
+
+class TaskRankTests(DashboardTestCase):
+
+    def column(self, board, status=Task.Status.TODO):
+        return list(board.tasks.filter(status=status).order_by('rank', 'id').values_list('id', flat=True))
+
+    def test_rank_between(self):
+        from dashboard_app.ranking import rank_between
+        ranks = ['']
+        for _ in range(200):
+            ranks.append(rank_between(ranks[-1], ''))
+        self.assertLessEqual(len(ranks[-1]), 7)
+        for _ in range(200):
+            ranks.insert(2, rank_between(ranks[1], ranks[2]))
+        self.assertEqual(ranks[1:], sorted(ranks[1:]))
+        self.assertEqual(len(set(ranks)), len(ranks))
+
+    def test_no_rank_below_trailing_zeros(self):
+        from dashboard_app.ranking import rank_between
+        for low, high in [('', '0'), ('z', 'z0'), ('a', 'a00')]:
+            with self.assertRaises(ValueError):
+                rank_between(low, high)
+        self.assertLess(rank_between('', '01'), '01')
+
+    def test_move_before_rank_without_gap_rebalances(self):
+        board = self.boards[0]
+        first, second, third = self.column(board)
+        Task.objects.filter(id=first).update(rank='z')
+        Task.objects.filter(id=second).update(rank='z0')
+        Task.objects.filter(id=third).update(rank='z1')
+        response = self.client.post(f'/api/tasks/{third}/move/', {'before': second}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column(board), [first, third, second])
+
+    def test_new_tasks_are_appended(self):
+        board = self.boards[0]
+        ids = self.column(board)
+        self.assertEqual(ids, sorted(ids))
+
+    def test_move_writes_one_row(self):
+        board = self.boards[0]
+        first, second, third = self.column(board)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(f'/api/tasks/{third}/move/', {'after': first}, format='json')
+        writes = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "dashboard_app_task"')]
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column(board), [first, third, second])
+
+        response = self.client.post(f'/api/tasks/{first}/move/', {'status': 'done'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column(board, Task.Status.DONE)[-1], first)
+
+        response = self.client.post(f'/api/tasks/{second}/move/', {'before': third}, format='json')
+        self.assertEqual(self.column(board), [second, third])
+
+    def test_board_detail_returns_ranked_columns(self):
+        board = self.boards[0]
+        first, second, third = self.column(board)
+        self.client.post(f'/api/tasks/{first}/move/', {'after': third}, format='json')
+        tasks = self.client.get(f'/api/boards/{board.id}/').json()['tasks']
+        todo = [t['id'] for t in tasks if t['status'] == 'to-do']
+        self.assertEqual(todo, [second, third, first])
+
+    def test_repeated_moves_stay_ordered(self):
+        board = self.boards[0]
+        first, second, third = self.column(board)
+        for _ in range(150):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(f'/api/tasks/{third}/move/', {'after': first, 'before': second}, format='json')
+            first, second, third = self.column(board)
+        self.assertLessEqual(max(len(r) for r in board.tasks.values_list('rank', flat=True)), 25)
+
+    def test_rebalance_command(self):
+        board = self.boards[0]
+        order = self.column(board)
+        for task_id, rank in zip(order, ['h' * 20, 'i' * 20, 'j' * 20]):
+            Task.objects.filter(id=task_id).update(rank=rank)
+        call_command('rebalance_task_ranks', stdout=StringIO())
+        self.assertEqual(self.column(board), order)
+        self.assertEqual({len(r) for r in board.tasks.values_list('rank', flat=True)}, {1})
+
+    def test_invalid_neighbours(self):
+        board = self.boards[0]
+        first, second, third = self.column(board)
+        response = self.client.post(f'/api/tasks/{first}/move/', {'after': third, 'before': second}, format='json')
+        self.assertEqual(response.status_code, 400)
+        other = self.boards[1].tasks.first().id
+        response = self.client.post(f'/api/tasks/{first}/move/', {'after': other}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class BoardEventTests(DashboardTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.token = Token.objects.create(user=self.user)
+
+    def test_model_changes_publish_events(self):
+        board = self.boards[0]
+        published = []
+        with mock.patch.object(get_broker(), 'publish', lambda board_id, event: published.append(event)):
+            with self.captureOnCommitCallbacks(execute=True):
+                task = Task.objects.create(
+                    board=board, title='New', due_date='2025-01-01',
+                    priority=Task.Priority.LOW, status=Task.Status.TODO,
+                )
+                Comment.objects.create(task=task, user=self.user, content='Hi')
+                board.members.remove(self.other)
+                task.delete()
+        self.assertEqual(
+            [event['type'] for event in published],
+            ['task.created', 'comment.created', 'members.changed', 'task.deleted'],
+        )
+
+    def test_stream_requires_access(self):
+        self.assertEqual(self.client.get(f'/api/boards/{self.boards[0].id}/events/').status_code, 401)
+        url = f'/api/boards/{self.foreign_board.id}/events/?token={self.token.key}'
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    @override_settings(BOARD_EVENT_HEARTBEAT=0.05)
+    def test_wsgi_requests_fall_back_to_long_poll(self):
+        url = f'/api/boards/{self.boards[0].id}/events/?token={self.token.key}'
+        response = self.client.get(url)
+        with self.assertWarns(Warning):
+            content = b''.join(response)
+        self.assertEqual(content, b'retry: 3000\n\n: ping\n\n')
+
+    async def test_stream_delivers_published_events(self):
+        board_id = self.boards[0].id
+        client = AsyncClient()
+        response = await client.get(f'/api/boards/{board_id}/events/', headers={'Authorization': f'Token {self.token.key}'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b'retry: 3000\n\n')
+
+        pending = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0.05)
+        get_broker().publish(board_id, {'type': 'task.updated', 'board': board_id, 'id': 7})
+        chunk = await asyncio.wait_for(pending, 2)
+        self.assertEqual(chunk, b'event: task.updated\ndata: {"type": "task.updated", "board": %d, "id": 7}\n\n' % board_id)
+        pending = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertNotIn(board_id, get_broker().subscriptions)
+
+
+@override_settings(SYNC_TOKEN_OVERLAP=0)
+class BoardChangesTests(DashboardTestCase):
+
+    def test_changes_since_token(self):
+        board = self.boards[0]
+        url = f'/api/boards/{board.id}/changes/'
+        snapshot = self.client.get(url).json()
+        self.assertTrue(snapshot['reset'])
+        self.assertEqual(len(snapshot['tasks']), 4)
+        self.assertEqual(len(snapshot['comments']), 4)
+        self.assertEqual(snapshot['board']['title'], 'Board 0')
+
+        tasks = list(board.tasks.order_by('id'))
+        tasks[0].title = 'Changed'
+        tasks[0].save()
+        tasks[1].comments.first().delete()
+        tasks[2].board = self.boards[1]
+        tasks[2].save()
+        deleted_id = tasks[3].id
+        tasks[3].delete()
+
+        changes = self.client.get(url, {'since': snapshot['token']}).json()
+        self.assertFalse(changes['reset'])
+        self.assertIsNone(changes['board'])
+        # The task that lost a comment comes back with its new comment count.
+        self.assertEqual(
+            {t['id']: t['comments_count'] for t in changes['tasks']}, {tasks[0].id: 1, tasks[1].id: 0},
+        )
+        self.assertEqual(changes['comments'], [])
+        self.assertEqual(sorted(changes['deleted']['tasks']), sorted([tasks[2].id, deleted_id]))
+        self.assertEqual(len(changes['deleted']['comments']), 1)
+
+        # Comments of a task that moved in arrive with it.
+        target = self.client.get(f'/api/boards/{self.boards[1].id}/changes/', {'since': snapshot['token']}).json()
+        self.assertIn(tasks[2].id, [t['id'] for t in target['tasks']])
+        self.assertEqual([c['id'] for c in target['comments']], list(tasks[2].comments.values_list('id', flat=True)))
+
+        board.members.remove(self.other)
+        changes = self.client.get(url, {'since': changes['token']}).json()
+        self.assertEqual(len(changes['board']['members']), 1)
+        self.assertEqual(changes['tasks'], [])
+
+    def test_invalid_token(self):
+        response = self.client.get(f'/api/boards/{self.boards[0].id}/changes/', {'since': '!!'})
+        self.assertEqual(response.status_code, 400)
+
+
+class CounterTests(DashboardTestCase):
+
+    def counters(self, board):
+        board.refresh_from_db()
+        return [board.member_count, board.ticket_count, board.tasks_to_do_count, board.tasks_high_prio_count]
+
+    def test_counters_follow_task_changes(self):
+        board, other_board = self.boards[0], self.boards[1]
+        self.assertEqual(self.counters(board), [2, 4, 3, 2])
+
+        task = Task.objects.create(board=board, title='New', due_date='2025-02-01',
+                                   priority=Task.Priority.HIGH, status=Task.Status.TODO)
+        self.assertEqual(self.counters(board), [2, 5, 4, 3])
+
+        task.status = Task.Status.DONE
+        task.priority = Task.Priority.LOW
+        task.save()
+        self.assertEqual(self.counters(board), [2, 5, 3, 2])
+
+        task.board = other_board
+        task.save()
+        self.assertEqual(self.counters(board), [2, 4, 3, 2])
+        self.assertEqual(self.counters(other_board), [2, 5, 3, 2])
+
+        task.delete()
+        self.assertEqual(self.counters(other_board), [2, 4, 3, 2])
+
+        board.members.remove(self.other)
+        self.assertEqual(self.counters(board), [1, 4, 3, 2])
+
+    def test_reverse_clear_updates_counters(self):
+        board = self.boards[0]
+        version = Board.objects.get(pk=board.pk).version
+        self.other.boards.clear()
+        self.assertEqual(self.counters(board), [1, 4, 3, 2])
+        self.assertGreater(board.version, version)
+
+    def test_bulk_writes_update_counters(self):
+        board, other_board = self.boards[0], self.boards[1]
+        moved = board.tasks.filter(status=Task.Status.TODO, priority=Task.Priority.HIGH).first()
+        response = self.client.post('/api/tasks/bulk/', [
+            {'board': board.id, 'title': 'A', 'due_date': '2025-03-01', 'priority': 'high', 'status': 'to-do',
+             'assignee_id': self.user.id, 'reviewer_id': self.other.id},
+            {'id': moved.id, 'board': other_board.id, 'status': 'done'},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(board), [2, 4, 3, 2])
+        self.assertEqual(self.counters(other_board), [2, 5, 3, 3])
+
+    def test_comment_count(self):
+        task = self.boards[0].tasks.first()
+        comment = Comment.objects.create(task=task, user=self.user, content='Another')
+        task.refresh_from_db()
+        self.assertEqual(task.comments_count, 2)
+        comment.delete()
+        task.refresh_from_db()
+        self.assertEqual(task.comments_count, 1)
+        response = self.client.get(f'/api/tasks/{task.id}/')
+        self.assertEqual(response.json()['comments_count'], 1)
+
+    def test_board_delete_cascades(self):
+        board = self.boards[0]
+        board.delete()
+        self.assertFalse(Task.objects.filter(board_id=board.id).exists())
+        self.assertEqual(self.counters(self.boards[1]), [2, 4, 3, 2])
+
+    def test_board_delete_cost_does_not_grow_with_comments(self):
+        board, other = self.boards[0], self.boards[1]
+        with CaptureQueriesContext(connection) as small:
+            Board.objects.get(pk=board.pk).delete()
+        task = other.tasks.first()
+        Comment.objects.bulk_create([Comment(task=task, user=self.user, content=f'c{i}') for i in range(20)])
+        with CaptureQueriesContext(connection) as large:
+            Board.objects.get(pk=other.pk).delete()
+        self.assertEqual(len(large), len(small))
+
+    def test_owner_delete_skips_cascaded_boards(self):
+        owned = [board for board in self.boards if board.owner == self.user]
+        kept = [board for board in self.boards if board.owner == self.other]
+        self.user.delete()
+        self.assertFalse(Board.objects.filter(pk__in=[board.pk for board in owned]).exists())
+        self.assertEqual(self.counters(kept[0])[1:], [4, 3, 2])
+        # The deleted user's comments on the remaining boards are uncounted.
+        self.assertEqual(set(kept[0].tasks.values_list('comments_count', flat=True)), {0})
+
+    def test_failed_board_delete_leaves_no_state(self):
+        board = self.boards[0]
+        with mock.patch('django.db.models.sql.subqueries.DeleteQuery.delete_batch', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Board.objects.get(pk=board.pk).delete()
+        board.tasks.filter(status=Task.Status.DONE).get().delete()
+        self.assertEqual(self.counters(board), [2, 3, 3, 1])
+
+    def test_recount_repairs_drift(self):
+        board = self.boards[0]
+        task = board.tasks.first()
+        Board.objects.filter(pk=board.pk).update(ticket_count=99, member_count=0)
+        Task.objects.filter(pk=task.pk).update(comments_count=7)
+        out = StringIO()
+        call_command('recount_board_stats', stdout=out)
+        self.assertIn('Repaired 1 board(s) and 1 task(s).', out.getvalue())
+        self.assertEqual(self.counters(board), [2, 4, 3, 2])
+        task.refresh_from_db()
+        self.assertEqual(task.comments_count, 1)
+
+
+class RequestLoaderTests(DashboardTestCase):
+
+    def task_selects(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format='json')
+        selects = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'FROM "dashboard_app_task"' in q['sql']]
+        return response, selects
+
+    def test_task_is_loaded_once_per_request(self):
+        task = self.boards[0].tasks.first()
+        for method, url, data in [
+            ('get', f'/api/tasks/{task.id}/', None),
+            ('patch', f'/api/tasks/{task.id}/', {'title': 'Renamed'}),
+            ('get', f'/api/tasks/{task.id}/comments/', None),
+            ('post', f'/api/tasks/{task.id}/comments/', {'content': 'Hi'}),
+        ]:
+            response, selects = self.task_selects(method, url, data)
+            self.assertLess(response.status_code, 300, url)
+            self.assertEqual(len(selects), 1, (method, url))
+
+    def test_move_loads_task_and_neighbours_together(self):
+        first, second, third = self.boards[0].tasks.filter(status=Task.Status.TODO).order_by('rank')
+        response, selects = self.task_selects('post', f'/api/tasks/{third.id}/move/', {'after': first.id, 'before': second.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(selects), 1)
+
+    def test_missing_task(self):
+        response = self.client.get('/api/tasks/999999/comments/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_batched_lookups(self):
+        from dashboard_app.loaders import RequestLoader
+        tasks = list(self.boards[0].tasks.all())
+        loader = RequestLoader()
+        loader.want(Task, *[task.id for task in tasks[1:]])
+        with self.assertNumQueries(1):
+            self.assertEqual(loader.load(Task, str(tasks[1].id)).id, tasks[1].id)
+            self.assertEqual(loader.load(Task, tasks[2].id).assignee, self.user)
+            self.assertIsNone(loader.load(Task, 'x'))
+        with self.assertNumQueries(0):
+            self.assertIs(loader.load(Task, tasks[3].id), loader.load_many(Task, [tasks[3].id])[tasks[3].id])
+
+
+class ValuesSerializerTests(DashboardTestCase):
+
+    def setUp(self):
+        super().setUp()
+        board = self.boards[0]
+        unnamed = User.objects.create_user('cleo', '', 'pw')
+        board.members.add(unnamed)
+        task = Task.objects.create(board=board, title='Ünïcode "quoted"', description='', due_date='2025-02-01',
+                                   priority=Task.Priority.MEDIUM, status=Task.Status.REVIEW, assignee=unnamed)
+        Comment.objects.create(task=task, user=unnamed, content='<b>hi</b>\n')
+
+    def assertParity(self, values_serializer, serializer_class, queryset):
+        from rest_framework.renderers import JSONRenderer
+        renderer = JSONRenderer()
+        expected = renderer.render(serializer_class(queryset, many=True).data)
+        actual = renderer.render(values_serializer.serialize(values_serializer.values(queryset)))
+        self.assertEqual(actual, expected)
+        return expected
+
+    def test_parity_with_drf_serializers(self):
+        from dashboard_app.api.serializer import BoardListSerializer, TaskCommentSerializer, TaskSerializer
+        from dashboard_app.api.values import (
+            BoardListValuesSerializer, TaskCommentValuesSerializer, TaskValuesSerializer,
+        )
+        self.assertParity(TaskValuesSerializer, TaskSerializer, Task.objects.order_by('id'))
+        self.assertParity(TaskCommentValuesSerializer, TaskCommentSerializer, Comment.objects.order_by('id'))
+        self.assertParity(BoardListValuesSerializer, BoardListSerializer, Board.objects.order_by('id'))
+
+    def test_list_endpoints_match_drf_output(self):
+        from rest_framework.renderers import JSONRenderer
+        from dashboard_app.api.serializer import TaskCommentSerializer, TaskSerializer
+        renderer = JSONRenderer()
+        task = Task.objects.get(status=Task.Status.REVIEW)
+        cases = [
+            ('/api/tasks/', TaskSerializer, Task.objects.order_by('due_date', 'id')),
+            ('/api/tasks/assigned-to-me/', TaskSerializer, Task.objects.filter(assignee=self.user).order_by('due_date', 'id')),
+            (f'/api/tasks/{task.id}/comments/', TaskCommentSerializer, task.comments.order_by('-created_at', '-id')),
+        ]
+        for url, serializer_class, queryset in cases:
+            response = self.client.get(url)
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+            self.assertEqual(content, renderer.render(serializer_class(queryset, many=True).data), url)
+
+        response = self.client.get('/api/tasks/', {'page_size': 5})
+        expected = TaskSerializer(Task.objects.order_by('due_date', 'id')[:5], many=True).data
+        self.assertEqual(renderer.render(response.json()['results']), renderer.render(expected))
+        self.assertIsNotNone(response.json()['next'])
+
+
+@override_settings(LIST_STREAM_CHUNK_SIZE=3)
+class StreamingListTests(DashboardTestCase):
+
+    def test_task_list_is_streamed_in_chunks(self):
+        from dashboard_app.api.renderers import StreamingJSONRenderer
+        response = self.client.get('/api/tasks/assigned-to-me/')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('ETag', response)
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(len(json.loads(b''.join(chunks))), 12)
+
+        renderer = StreamingJSONRenderer()
+        self.assertEqual(b''.join(renderer.render_stream([], 3)), b'[]')
+        items = [{'a': i, 'b': 'ü'} for i in range(7)]
+        self.assertEqual(b''.join(renderer.render_stream(items, 3)), renderer.render(items))
+
+    def test_paginated_requests_are_not_streamed(self):
+        response = self.client.get('/api/tasks/assigned-to-me/', {'page_size': 5})
+        self.assertFalse(response.streaming)
+
+
+class DatabaseProfileTests(DashboardTestCase):
+
+    def test_sqlite_pragmas_are_applied(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_router_uses_replica_for_safe_requests_only(self):
+        from django.conf import settings
+        from core.routers import PrimaryReplicaRouter, ReplicaReadMiddleware
+        router = PrimaryReplicaRouter()
+        seen = []
+        middleware = ReplicaReadMiddleware(lambda request: seen.append(router.db_for_read(Task)))
+        request = mock.Mock()
+        with mock.patch.dict(settings.DATABASES, {'replica': settings.DATABASES['default']}):
+            for method in ('GET', 'POST', 'HEAD', 'PATCH'):
+                request.method = method
+                middleware(request)
+            self.assertEqual(router.db_for_read(Task), 'default')
+        self.assertEqual(seen, ['replica', 'default', 'replica', 'default'])
+        self.assertEqual(router.db_for_write(Task), 'default')
+        request.method = 'GET'
+        with mock.patch.dict(settings.DATABASES, {'default': settings.DATABASES['default']}, clear=True):
+            middleware(request)
+        self.assertEqual(seen[-1], 'default')
+
+
+@skipUnless('replica' in settings.DATABASES, 'DATABASE_REPLICA_NAME is not set')
+class ReplicaRoutingTests(TransactionTestCase):
+    """The test replica mirrors the test database. Only runs with a replica::
+
+        DATABASE_REPLICA_NAME=replica.sqlite3 python manage.py test
+    """
+    databases = {'default', 'replica'} if 'replica' in settings.DATABASES else {'default'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Board.objects.create(owner=self.user, title='Board')
+
+    def test_reads_and_writes_are_split(self):
+        with CaptureQueriesContext(connections['replica']) as replica, CaptureQueriesContext(connection) as primary:
+            response = self.client.get('/api/boards/')
+        self.assertEqual([board['title'] for board in response.json()], ['Board'])
+        self.assertTrue(replica.captured_queries)
+        self.assertFalse(primary.captured_queries)
+
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.post('/api/boards/', {'title': 'New', 'members': []}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(replica.captured_queries)
+
+
+@override_settings(DATABASE_ROUTERS=[])
+class BenchTests(TestCase):
+
+    def test_seed_is_deterministic(self):
+        from dashboard_app import bench
+        data = bench.seed(users=4, boards=2, tasks=6, comments=2, seed=7)
+        rows = list(Task.objects.order_by('id').values_list('title', 'status', 'priority', 'due_date', 'rank'))
+        board = Board.objects.get(pk=data['board'].pk)
+        self.assertEqual(board.ticket_count, 6)
+        self.assertEqual(Comment.objects.count(), 24)
+        self.assertEqual(board.member_count, 4)
+
+        Board.objects.all().delete()
+        User.objects.all().delete()
+        bench.seed(users=4, boards=2, tasks=6, comments=2, seed=7)
+        self.assertEqual(list(Task.objects.order_by('id').values_list('title', 'status', 'priority', 'due_date', 'rank')), rows)
+
+    @override_settings(BOARD_EVENT_HEARTBEAT=0)
+    def test_every_endpoint_succeeds(self):
+        from dashboard_app import bench
+        data = bench.seed(users=3, boards=2, tasks=6, comments=1)
+        results = bench.run(data, iterations=2)
+        self.assertEqual(len(results), len(bench.ENDPOINTS))
+        for name, result in results.items():
+            self.assertTrue(all(code.startswith('2') for code in result['status']), (name, result['status']))
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertGreater(result['peak_alloc_kib'], 0)
+
+
+@override_settings(PERFORMANCE_METRICS_ENABLED=True)
+class PerformanceMetricsTests(DashboardTestCase):
+
+    def setUp(self):
+        super().setUp()
+        from core.metrics import registry
+        registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_header(self):
+        task = self.boards[0].tasks.first()
+        response = self.client.get(f'/api/tasks/{task.id}/')
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;desc="[1-9]\d* queries";dur=[\d.]+, serializer;dur=[\d.]+, total;dur=[\d.]+$',
+        )
+        serializer_ms = float(response['Server-Timing'].split('serializer;dur=')[1].split(',')[0])
+        self.assertGreater(serializer_ms, 0)
+
+    async def test_async_chain_stays_async(self):
+        from asgiref.sync import iscoroutinefunction
+        from core.metrics import PerformanceMiddleware
+
+        async def view(request):
+            pass
+        self.assertTrue(iscoroutinefunction(PerformanceMiddleware(view)))
+
+        token = await Token.objects.acreate(user=self.user)
+        response = await AsyncClient().get('/api/boards/async/', headers={'Authorization': f'Token {token.key}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'^db;desc="[1-9]\d* queries"')
+
+    def test_drf_serializers_are_left_untouched(self):
+        from rest_framework.serializers import BaseSerializer
+        data = BaseSerializer.__dict__['data']
+        self.client.get(f'/api/tasks/{self.boards[0].tasks.first().id}/')
+        self.assertIs(BaseSerializer.__dict__['data'], data)
+
+    def test_metrics_are_aggregated_per_route_for_staff(self):
+        task = self.boards[0].tasks.first()
+        for _ in range(3):
+            self.client.get(f'/api/tasks/{task.id}/')
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('http_request_duration_seconds_count{route="api/tasks/<int:pk>/",method="GET"} 3', body)
+        self.assertIn('http_requests_total{route="api/tasks/<int:pk>/",method="GET",status="200"} 3', body)
+        self.assertIn('# TYPE http_request_db_queries histogram', body)
+
+    @override_settings(PERFORMANCE_METRICS_ENABLED=False)
+    def test_disabled_by_default(self):
+        response = APIClient().get('/api/boards/')
+        self.assertNotIn('Server-Timing', response)
+
+
+class SearchTests(DashboardTestCase):
+
+    def search(self, q, **params):
+        return self.client.get('/api/search/', {'q': q, **params})
+
+    def test_tasks_and_comments_are_found(self):
+        board = self.boards[0]
+        task = board.tasks.first()
+        task.title = 'Fix the café <login> page'
+        task.save()
+        Comment.objects.create(task=task, user=self.user, content='The login form breaks on Safari')
+        Task.objects.create(board=self.foreign_board, title='Foreign login bug', due_date='2025-01-01',
+                            priority='low', status='to-do')
+
+        response = self.search('login')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([(hit['type'], hit['task_id']) for hit in results], [('task', task.id), ('comment', task.id)])
+        self.assertEqual(results[0]['snippet'], 'Fix the café &lt;<mark>login</mark>&gt; page')
+        self.assertEqual(results[0]['board_id'], board.id)
+
+        self.assertEqual(len(self.search('cafe').json()['results']), 1)
+        self.assertEqual(len(self.search('saf').json()['results']), 1)
+        self.assertEqual(self.search('"login" OR NEAR(').status_code, 200)
+        self.assertEqual(self.search('  ').status_code, 400)
+
+    def test_index_follows_changes(self):
+        task = self.boards[0].tasks.first()
+        comment = task.comments.first()
+        Task.objects.filter(pk=task.pk).update(title='Quarterly roadmap')
+        self.assertEqual(len(self.search('roadmap').json()['results']), 1)
+        comment.content = 'roadmap draft attached'
+        comment.save()
+        self.assertEqual(len(self.search('roadmap').json()['results']), 2)
+        comment.delete()
+        self.assertEqual(len(self.search('roadmap').json()['results']), 1)
+        task.delete()
+        self.assertEqual(self.search('roadmap').json()['results'], [])
+
+    def test_cursor_pagination(self):
+        ids, url, pages = [], '/api/search/?q=task&page_size=5', 0
+        while url:
+            body = self.client.get(url).json()
+            ids += [(hit['type'], hit['id']) for hit in body['results']]
+            url, pages = body['next'], pages + 1
+        self.assertEqual(len(ids), 12)
+        self.assertEqual(len(set(ids)), 12)
+        self.assertEqual(pages, 3)
+        self.assertEqual(self.search('task', cursor='garbage').status_code, 404)
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM dashboard_app_search')
+        self.assertEqual(self.search('task').json()['results'], [])
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 24', out.getvalue())
+        self.assertEqual(len(self.search('task', page_size=50).json()['results']), 12)
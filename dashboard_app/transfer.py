@@ -0,0 +1,274 @@
+import csv
+import io
+import json
+import re
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from dashboard_app.counters import board_counter_expressions, task_counter_expressions
+from dashboard_app.models import Board, Task, Comment
+from dashboard_app.ranking import rank_between
+
+# Columns of the CSV format; every record fills the columns of its type.
+CSV_COLUMNS = (
+    'type', 'id', 'task', 'title', 'description', 'due_date', 'priority', 'status', 'rank',
+    'owner', 'members', 'assignee', 'reviewer', 'creator', 'user', 'content',
+)
+
+TASK_FIELDS = ('title', 'description', 'due_date', 'priority', 'status')
+
+# Ranks kept from an import; anything else gets a fresh rank at the end of its column.
+# A trailing '0' is refused, as no rank fits between such a rank and its prefix.
+IMPORTED_RANK = re.compile(r'[0-9a-z]{0,63}[1-9a-z]')
+
+
+class BoardImportError(ValueError):
+    """An export stream that cannot be imported, with the record it failed on."""
+
+    def __init__(self, message, record=None):
+        super().__init__(f'Record {record}: {message}' if record else message)
+        self.record = record
+
+
+def export_records(board, chunk_size):
+    """Yield the board, its tasks and their comments as plain records.
+
+    Users are referenced by email. Tasks and comments are read in chunks
+    of ``chunk_size`` rows from the database the board came from, so
+    memory does not grow with the board. Comments of tasks created after
+    the task scan are left out, so every comment refers to an exported task.
+    """
+    using = board._state.db
+    yield {
+        'type': 'board',
+        'id': board.id,
+        'title': board.title,
+        'owner': board.owner.email,
+        'members': list(board.members.using(using).order_by('id').values_list('email', flat=True)),
+    }
+    last_task_id = 0
+    tasks = (
+        Task.objects.using(using).filter(board=board).order_by('id')
+        .values_list('id', *TASK_FIELDS, 'rank', 'assignee__email', 'reviewer__email', 'creator__email', named=True)
+    )
+    for task in tasks.iterator(chunk_size=chunk_size):
+        last_task_id = task.id
+        yield {
+            'type': 'task', 'id': task.id,
+            **{field: getattr(task, field) for field in TASK_FIELDS},
+            'due_date': task.due_date.isoformat(),
+            'rank': task.rank,
+            'assignee': task.assignee__email,
+            'reviewer': task.reviewer__email,
+            'creator': task.creator__email,
+        }
+    comments = (
+        Comment.objects.using(using).filter(task__board=board, task_id__lte=last_task_id).order_by('id')
+        .values_list('id', 'task_id', 'user__email', 'content', named=True)
+    )
+    for comment in comments.iterator(chunk_size=chunk_size):
+        yield {
+            'type': 'comment', 'id': comment.id, 'task': comment.task_id,
+            'user': comment.user__email, 'content': comment.content,
+        }
+
+
+def render_ndjson(records):
+    """Yield one JSON line per record."""
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def render_csv(records):
+    """Yield a CSV header and one line per record; members are space separated."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    for record in records:
+        if 'members' in record:
+            record = {**record, 'members': ' '.join(record['members'])}
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def parse_ndjson(lines):
+    """Yield the records of NDJSON lines, skipping blank lines."""
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            raise BoardImportError(f'invalid JSON ({exc}).', number)
+        if not isinstance(record, dict):
+            raise BoardImportError('expected a JSON object.', number)
+        yield record
+
+
+def parse_csv(lines):
+    """Yield the records of CSV lines written by :func:`render_csv`."""
+    lines = (line.decode('utf-8') if isinstance(line, bytes) else line for line in lines)
+    for row in csv.DictReader(lines):
+        record = {key: value for key, value in row.items() if key in CSV_COLUMNS and value != ''}
+        if record.get('type') == 'board':
+            record['members'] = record.get('members', '').split()
+        yield record
+
+
+class BoardImporter:
+    """Create a new board from export records.
+
+    The importing user owns the new board. Ids are remapped and users are
+    matched by email; unknown assignees, reviewers and creators are left
+    empty and comments of unknown authors are attributed to the owner.
+    Superusers are never added as members, as in the board serializers.
+    Records are written with ``bulk_create`` in batches of ``batch_size``,
+    each in its own transaction, and the board is deleted again if the
+    import fails part way.
+    """
+
+    def __init__(self, owner, batch_size):
+        self.owner = owner
+        self.batch_size = max(1, batch_size)
+        self.board = None
+        self.members = []
+        self.task_ids = {}
+        self.user_ids = {owner.email.lower(): owner.id} if owner.email else {}
+        self.unknown_emails = set()
+        self.last_ranks = {}
+        self.pending = []
+        self.comment_count = 0
+
+    def run(self, records):
+        """Import the records and return the new board."""
+        try:
+            for number, record in enumerate(records, start=1):
+                self.add(record, number)
+            self.flush()
+            if self.board is None:
+                raise BoardImportError('the stream holds no board record.')
+            self.finish()
+        except BaseException:
+            if self.board is not None:
+                self.board.delete()
+            raise
+        return self.board
+
+    def summary(self):
+        return {
+            'id': self.board.id,
+            'tasks': len(self.task_ids),
+            'comments': self.comment_count,
+            'unknown_users': sorted(self.unknown_emails),
+        }
+
+    def add(self, record, number):
+        kind = record.get('type')
+        if kind == 'board':
+            if self.board is not None:
+                raise BoardImportError('a stream holds exactly one board.', number)
+            self.board = Board.objects.create(owner=self.owner, title=self.clean(Board, 'title', record, number))
+            self.members = record.get('members') or []
+            return
+        if self.board is None:
+            raise BoardImportError('the board record must come first.', number)
+        if kind not in ('task', 'comment'):
+            raise BoardImportError(f'unknown record type {kind!r}.', number)
+        if self.pending and self.pending[-1][0] != kind:
+            self.flush()
+        self.pending.append((kind, record, number))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def clean(self, model, name, record, number):
+        """Validate one value of a record against the model field; empty values take the default."""
+        field = model._meta.get_field(name)
+        value = record.get(name)
+        if value in (None, '') and field.has_default():
+            return field.get_default()
+        try:
+            return field.clean(value, None)
+        except ValidationError as exc:
+            raise BoardImportError(f'{name}: {" ".join(exc.messages)}', number)
+
+    def resolve_users(self, emails):
+        """Map lower-cased emails to user ids, loading the unseen ones in one query."""
+        missing = {email.lower() for email in emails if email} - set(self.user_ids) - self.unknown_emails
+        if missing:
+            found = dict(
+                User.objects.annotate(email_lower=Lower('email'))
+                .filter(email_lower__in=missing).values_list('email_lower', 'id')
+            )
+            self.user_ids.update(found)
+            self.unknown_emails |= missing - set(found)
+
+    def user_id(self, email):
+        return self.user_ids.get(email.lower()) if email else None
+
+    def flush(self):
+        """Write the pending records of one type in a single transaction."""
+        if not self.pending:
+            return
+        kind = self.pending[0][0]
+        users = ('assignee', 'reviewer', 'creator') if kind == 'task' else ('user',)
+        self.resolve_users(record.get(field) for _, record, _ in self.pending for field in users)
+        with transaction.atomic():
+            if kind == 'task':
+                self.create_tasks()
+            else:
+                self.create_comments()
+        self.pending = []
+
+    def create_tasks(self):
+        tasks, old_ids = [], []
+        for _, record, number in self.pending:
+            values = {field: self.clean(Task, field, record, number) for field in TASK_FIELDS}
+            last = self.last_ranks.get(values['status'], '')
+            rank = record.get('rank')
+            if not isinstance(rank, str) or not IMPORTED_RANK.fullmatch(rank):
+                rank = rank_between(last, '')
+            self.last_ranks[values['status']] = max(rank, last)
+            tasks.append(Task(
+                board=self.board, rank=rank, **values,
+                assignee_id=self.user_id(record.get('assignee')),
+                reviewer_id=self.user_id(record.get('reviewer')),
+                creator_id=self.user_id(record.get('creator')),
+            ))
+            old_ids.append(record.get('id'))
+        Task.objects.bulk_create(tasks)
+        for old_id, task in zip(old_ids, tasks):
+            if old_id is not None:
+                self.task_ids[str(old_id)] = task.id
+
+    def create_comments(self):
+        comments = []
+        for _, record, number in self.pending:
+            task_id = self.task_ids.get(str(record.get('task')))
+            if task_id is None:
+                raise BoardImportError(f'unknown task {record.get("task")!r}.', number)
+            comments.append(Comment(
+                task_id=task_id,
+                user_id=self.user_id(record.get('user')) or self.owner.id,
+                content=self.clean(Comment, 'content', record, number),
+            ))
+        Comment.objects.bulk_create(comments)
+        self.comment_count += len(comments)
+
+    def finish(self):
+        """Add the members and fill the counters ``bulk_create`` left untouched."""
+        self.resolve_users(self.members)
+        members = {self.user_id(email) for email in self.members} - {None}
+        members -= set(User.objects.filter(pk__in=members, is_superuser=True).values_list('id', flat=True))
+        with transaction.atomic():
+            Task.objects.filter(board=self.board).update(**task_counter_expressions())
+            Board.objects.filter(pk=self.board.pk).update(**board_counter_expressions())
+            self.board.members.add(*members)
+        self.board.refresh_from_db()
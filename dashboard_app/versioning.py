@@ -0,0 +1,19 @@
+from django.db.models import F
+from django.utils import timezone
+
+from dashboard_app.models import Board
+
+
+def bump_board_version(*board_ids, touch=False):
+    """Increment the version of the given boards in a single UPDATE.
+
+    With ``touch`` the boards' ``updated_at`` is set as well, for changes to
+    the board row or its members that bypass ``save()``.
+    """
+    board_ids = {board_id for board_id in board_ids if board_id is not None}
+    if board_ids:
+        changes = {'version': F('version') + 1}
+        if touch:
+            changes['updated_at'] = timezone.now()
+        Board.objects.filter(id__in=board_ids).update(**changes)
+
@@ -1,5 +1,10 @@
 from rest_framework import serializers
+from rest_framework.authtoken.serializers import AuthTokenSerializer
 from django.contrib.auth.models import User
+from django.utils.translation import gettext_lazy as _
+from django.db import IntegrityError, transaction
+from user_auth_app.backends import authenticate_email
+from user_auth_app.utils import UsernameAllocator, split_full_name, users_with_email
 
 class RegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration with full name and password confirmation."""
@@ -14,8 +19,14 @@ class RegistrationSerializer(serializers.ModelSerializer):
             'password': {'write_only': True}
         }
 
+    username_attempts = 5
+
     def create(self, validated_data):
-        """Create user with parsed full name and hashed password."""
+        """Create user with parsed full name and hashed password.
+
+        A concurrent signup can take the allocated username between the
+        scan and the insert; the insert is then retried with a new name.
+        """
         validated_data.pop('repeated_password')
         password = validated_data.pop('password')
         fullname = validated_data.pop('fullname')
@@ -23,14 +34,23 @@ class RegistrationSerializer(serializers.ModelSerializer):
         email = validated_data['email']
 
         user = User(
-            username=self.generate_username_from_email(email),
             email=email,
             first_name=first_name,
             last_name=last_name
         )
         user.set_password(password)
-        user.save()
-        return user
+        for attempt in range(self.username_attempts):
+            user.username = self.generate_username_from_email(email)
+            try:
+                with transaction.atomic():
+                    user.save()
+                return user
+            except IntegrityError:
+                if users_with_email(email).exists():
+                    raise serializers.ValidationError({'email': ['Email already exists']})
+                if attempt == self.username_attempts - 1:
+                    raise
+                user.pk = None
 
     def validate(self, data):
         """Check if both passwords match."""
@@ -40,23 +60,30 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
     def validate_email(self, value):
         """Ensure email is unique."""
-        if User.objects.filter(email=value).exists():
+        if users_with_email(value).exists():
             raise serializers.ValidationError('Email already exists')
         return value
 
     def split_name(self, fullname):
         """Split full name into first and last name."""
-        parts = fullname.strip().split()
-        first = parts[0]
-        last = " ".join(parts[1:]) if len(parts) > 1 else ""
-        return first, last
+        return split_full_name(fullname)
 
     def generate_username_from_email(self, email):
-        """Generate a unique username based on the email prefix."""
-        base = email.split('@')[0]
-        username = base
-        counter = 1
-        while User.objects.filter(username=username).exists():
-            username = f'{base}_{counter}'
-            counter += 1
-        return username
+        """Generate a unique username based on the email prefix in one query."""
+        return UsernameAllocator().allocate(email)
+
+
+class EmailLoginSerializer(AuthTokenSerializer):
+    """Token login with the email in ``username``, checking the password once.
+
+    ``authenticate()`` would also try the other authentication backends
+    after a failed email login and hash the password again.
+    """
+
+    def validate(self, attrs):
+        user = authenticate_email(attrs.get('username'), attrs.get('password'))
+        if not user:
+            msg = _('Unable to log in with provided credentials.')
+            raise serializers.ValidationError(msg, code='authorization')
+        attrs['user'] = user
+        return attrs
@@ -1,9 +1,11 @@
 from django.urls import path
 from rest_framework.authtoken.views import obtain_auth_token
-from .views import RegistrationView, CustomLoginView, EmailCheckView
+from .views import RegistrationView, CustomLoginView, EmailCheckView, AsyncEmailCheckView, async_login
 
 urlpatterns = [
     path('api/registration/', RegistrationView.as_view(), name='registration'),
     path('api/login/', CustomLoginView.as_view(), name='login'),
-    path('api/email-check/', EmailCheckView.as_view(), name='login')
+    path('api/login/async/', async_login, name='login-async'),
+    path('api/email-check/', EmailCheckView.as_view(), name='login'),
+    path('api/email-check/async/', AsyncEmailCheckView.as_view(), name='email-check-async'),
 ]
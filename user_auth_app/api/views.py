@@ -1,11 +1,19 @@
+import json
+
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from .serializers import RegistrationSerializer
+from .serializers import RegistrationSerializer, EmailLoginSerializer
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from rest_framework import status
 from rest_framework.authtoken.views import ObtainAuthToken
 from django.contrib.auth.models import User
+from core.async_views import AsyncAPIView, json_response
+from user_auth_app.backends import aauthenticate_email
+from user_auth_app.utils import users_with_email
 
 
 class RegistrationView(APIView):
@@ -29,8 +37,19 @@ class RegistrationView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def login_response(user, token):
+    """Return the login payload with the token and user info."""
+    return {
+        'token': token.key,
+        'user_id': user.id,
+        'email': user.email,
+        'fullname': f'{user.first_name} {user.last_name}',
+    }
+
+
 class CustomLoginView(ObtainAuthToken):
     """Custom login view using email instead of username."""
+    serializer_class = EmailLoginSerializer
 
     def post(self, request):
         """Authenticate user and return auth token."""
@@ -41,12 +60,7 @@ class CustomLoginView(ObtainAuthToken):
         if serializer.is_valid():
             user = serializer.validated_data['user']
             token, created = Token.objects.get_or_create(user=user)
-            return Response({
-                'token': token.key,
-                'user_id': user.id,
-                'email': user.email,
-                'fullname': f'{user.first_name} {user.last_name}',
-            }, status=status.HTTP_200_OK)
+            return Response(login_response(user, token), status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -66,7 +80,7 @@ class EmailCheckView(APIView):
             )
         
         try:
-            user = User.objects.get(email=email)
+            user = users_with_email(email).get()
             return Response({
                 'id': user.id,
                 'email': user.email,
@@ -77,3 +91,49 @@ class EmailCheckView(APIView):
                 {'error': 'User not found'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+
+class AsyncEmailCheckView(AsyncAPIView):
+    """Async :class:`EmailCheckView`."""
+
+    async def get(self, request):
+        email = request.GET.get('email')
+        if email is None:
+            return json_response({'error': 'Email parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user = await users_with_email(email).aget()
+        except User.DoesNotExist:
+            return json_response({'error': 'User not found'}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response({
+            'id': user.id,
+            'email': user.email,
+            'fullname': f'{user.first_name} {user.last_name}',
+        })
+
+
+@csrf_exempt
+@require_POST
+async def async_login(request):
+    """Log in like ``CustomLoginView`` without blocking the event loop.
+
+    The password hash runs in a bounded thread pool, so under ASGI other
+    requests are served while a burst of logins is being checked.
+    """
+    try:
+        data = json.loads(request.body or b'{}') if request.content_type == 'application/json' else request.POST
+    except ValueError:
+        return JsonResponse({'detail': 'JSON parse error.'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse(
+            {'non_field_errors': [f'Invalid data. Expected a dictionary, but got {type(data).__name__}.']}, status=400,
+        )
+
+    errors = {field: ['This field is required.'] for field in ('email', 'password') if not data.get(field)}
+    if errors:
+        return JsonResponse(errors, status=400)
+
+    user = await aauthenticate_email(data['email'], data['password'])
+    if user is None:
+        return JsonResponse({'non_field_errors': ['Unable to log in with provided credentials.']}, status=400)
+    token, created = await Token.objects.aget_or_create(user=user)
+    return JsonResponse(login_response(user, token))
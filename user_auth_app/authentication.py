@@ -0,0 +1,72 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+
+def token_cache_key(key):
+    """Return the cache key under which a token is stored."""
+    return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    """Drop a cached token so the next request resolves it again."""
+    cache.delete(token_cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that caches the token and its user.
+
+    Drop-in replacement for ``TokenAuthentication``. Resolved tokens are
+    kept for ``AUTH_TOKEN_CACHE_TIMEOUT`` seconds and dropped early by the
+    signal handlers in ``user_auth_app.signals``.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(cache_key, token, getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', 300))
+            return (user, token)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        return (token.user, token)
+
+    async def aauthenticate(self, request):
+        """Async :meth:`authenticate` for plain Django requests."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. Token string should not contain invalid characters.')
+            )
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        """Async :meth:`authenticate_credentials` using the async cache and ORM."""
+        cache_key = token_cache_key(key)
+        token = await cache.aget(cache_key)
+
+        if token is None:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related('user').aget(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            if token.user.is_active:
+                await cache.aset(cache_key, token, getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', 300))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
@@ -1,11 +1,67 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
-from django.contrib.auth.models import User
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+
+from user_auth_app.utils import users_with_email
+
+
+def verify_password(password, encoded):
+    """Check a password against a stored hash, hashing exactly once.
+
+    Without a stored hash the password is hashed anyway, so the time taken
+    does not reveal whether the account exists.
+    """
+    if encoded is None:
+        make_password(password)
+        return False
+    return check_password(password, encoded)
+
+
+def authenticate_email(email, password):
+    """Return the active user with this email and password, or None."""
+    user = users_with_email(email).first()
+    if user is None:
+        verify_password(password, None)
+        return None
+    if user.check_password(password) and user.is_active:
+        return user
+    return None
+
+
+@lru_cache(maxsize=None)
+def password_hash_pool():
+    """Return the thread pool password hashes of async logins run in."""
+    workers = getattr(settings, 'LOGIN_HASH_WORKERS', 4)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+
+
+async def aauthenticate_email(email, password):
+    """Async :func:`authenticate_email` hashing in :func:`password_hash_pool`.
+
+    The event loop keeps serving other requests while the hash runs, and
+    the pool bounds how many hashes run at once.
+    """
+    user = await users_with_email(email).afirst()
+    encoded = user.password if user is not None else None
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(password_hash_pool(), verify_password, password, encoded):
+        return None
+    if not user.is_active:
+        return None
+    if identify_hasher(encoded).must_update(encoded):
+        user.set_password(password)
+        await user.asave(update_fields=['password'])
+    return user
+
 
 class EmailAuthBackend(ModelBackend):
+    """Authenticate with the email address as username."""
+
     def authenticate(self, request, username=None, password=None, **kwargs):
-        try:
-            user = User.objects.get(email=username)
-            if user.check_password(password):
-                return user
-        except User.DoesNotExist:
-            return None
\ No newline at end of file
+        if not username or '@' not in username:
+            return None
+        return authenticate_email(username, password)
@@ -0,0 +1,114 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from user_auth_app.utils import UsernameAllocator, split_full_name, username_base
+
+
+def existing_emails(emails):
+    """Return the lower-cased emails among ``emails`` that belong to a user."""
+    emails = {email.lower() for email in emails}
+    if not emails:
+        return set()
+    return set(
+        User.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=emails).values_list('email_lower', flat=True)
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Create users from a CSV file with an "email" column and either "fullname" or '
+        '"first_name"/"last_name" columns, plus an optional "password" column. Rows whose '
+        'email already exists are skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import.')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--hash-workers', type=int, default=4, help='Threads hashing passwords.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as handle:
+                rows = list(csv.DictReader(handle))
+        except OSError as exc:
+            raise CommandError(exc)
+        if rows and 'email' not in rows[0]:
+            raise CommandError('The CSV file needs an "email" column.')
+
+        users, skipped = self.parse_rows(rows)
+        created = 0
+        batch_size = max(1, options['batch_size'])
+        with ThreadPoolExecutor(max_workers=max(1, options['hash_workers'])) as pool:
+            for start in range(0, len(users), batch_size):
+                batch = users[start:start + batch_size]
+                self.hash_passwords(batch, pool)
+                created += self.create_batch(batch)
+        skipped += len(users) - created
+        self.stdout.write(self.style.SUCCESS(f'Created {created} user(s), skipped {skipped} row(s).'))
+
+    def parse_rows(self, rows):
+        """Build unsaved users from valid rows with emails not taken yet."""
+        users, seen, skipped = [], set(), 0
+        for line, row in enumerate(rows, start=2):
+            email = (row.get('email') or '').strip()
+            try:
+                validate_email(email)
+            except ValidationError:
+                self.stderr.write(f'Line {line}: invalid email {email!r}, skipped.')
+                skipped += 1
+                continue
+            if email.lower() in seen:
+                skipped += 1
+                continue
+            seen.add(email.lower())
+
+            if row.get('fullname'):
+                first_name, last_name = split_full_name(row['fullname'])
+            else:
+                first_name, last_name = (row.get('first_name') or '').strip(), (row.get('last_name') or '').strip()
+            user = User(email=email, first_name=first_name, last_name=last_name)
+            user.raw_password = row.get('password') or None
+            users.append(user)
+
+        existing = existing_emails(seen)
+        fresh = [user for user in users if user.email.lower() not in existing]
+        return fresh, skipped + len(users) - len(fresh)
+
+    def hash_passwords(self, users, pool):
+        """Hash the passwords of a batch in parallel; hashlib releases the GIL."""
+        hashes = pool.map(lambda user: make_password(user.raw_password), users)
+        for user, password in zip(users, hashes):
+            user.password = password
+
+    def create_batch(self, users, attempts=3):
+        """Insert a batch with allocated usernames and return how many were created.
+
+        Concurrent signups may take a username or email in the meantime; the
+        batch is then retried without the taken emails and with fresh names.
+        """
+        for attempt in range(attempts):
+            allocator = UsernameAllocator()
+            allocator.load(username_base(user.email) for user in users)
+            for user in users:
+                user.username = allocator.allocate(user.email)
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create(users)
+                return len(users)
+            except IntegrityError:
+                if attempt == attempts - 1:
+                    raise
+                taken = existing_emails(user.email for user in users)
+                users = [user for user in users if user.email.lower() not in taken]
+                for user in users:
+                    user.pk = None
+        return 0
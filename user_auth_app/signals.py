@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user_auth_app.authentication import invalidate_token
+
+
+@receiver(post_delete, sender=Token)
+def drop_deleted_token(sender, instance, **kwargs):
+    """Forget a token once it is deleted or replaced by a new key."""
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=Token)
+def drop_saved_token(sender, instance, **kwargs):
+    """Forget a token whose row was rewritten."""
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def drop_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    """Forget the user's tokens so deactivation and profile edits apply at once."""
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        invalidate_token(key)
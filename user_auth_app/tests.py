@@ -1,3 +1,196 @@
-from django.test import TestCase
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user_auth_app.utils import UsernameAllocator, users_with_email
+
+
+@override_settings(DATABASE_ROUTERS=[])
+class EmailLookupTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('anna', 'Anna@Example.com', 'pw', first_name='Anna', last_name='Lee')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_lookup_uses_lower_email_index(self):
+        plan = users_with_email('anna@example.com').explain()
+        self.assertIn('USING INDEX auth_user_email_lower_uniq', plan)
+
+    def test_email_check_is_case_insensitive(self):
+        response = self.client.get('/api/email-check/', {'email': 'ANNA@example.COM'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], self.user.id)
+
+    async def test_async_email_check(self):
+        token = await Token.objects.acreate(user=self.user)
+        client, headers = AsyncClient(), {'Authorization': f'Token {token.key}'}
+        response = await client.get('/api/email-check/async/', {'email': 'ANNA@example.COM'}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'id': self.user.id, 'email': self.user.email, 'fullname': 'Anna Lee'})
+        response = await client.get('/api/email-check/async/', {'email': 'nobody@example.com'}, headers=headers)
+        self.assertEqual((response.status_code, response.json()), (400, {'error': 'User not found'}))
+        response = await AsyncClient().get('/api/email-check/async/', {'email': 'anna@example.com'})
+        self.assertEqual(response.status_code, 401)
+
+    def test_email_is_unique_ignoring_case(self):
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user('anna2', 'anna@example.com', 'pw')
+
+    def test_blank_emails_are_not_unique(self):
+        User.objects.create_user('x1', '', 'pw')
+        User.objects.create_user('x2', '', 'pw')
+
+
+@override_settings(DATABASE_ROUTERS=[])
+class CachedTokenAuthenticationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'pw')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def check(self):
+        return self.client.get('/api/email-check/', {'email': 'anna@example.com'}).status_code
+
+    def test_token_is_resolved_from_cache(self):
+        self.assertEqual(self.check(), 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.check(), 200)
+
+    def test_deleted_token_is_rejected(self):
+        self.check()
+        self.token.delete()
+        self.assertEqual(self.check(), 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.check()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.check(), 401)
+
+
+class UsernameAllocationTests(TestCase):
+
+    def setUp(self):
+        for name in ['info', 'info_1', 'info_7', 'info_team', 'infos', 'info_2x']:
+            User.objects.create_user(name, f'{name}@old.example.com', 'pw')
+
+    def test_allocation_uses_one_query(self):
+        allocator = UsernameAllocator()
+        with self.assertNumQueries(1):
+            names = [allocator.allocate('info@example.com') for _ in range(3)]
+        self.assertEqual(names, ['info_8', 'info_9', 'info_10'])
+        self.assertEqual(UsernameAllocator().allocate('new@example.com'), 'new')
+
+    def test_registration(self):
+        response = APIClient().post('/api/registration/', {
+            'fullname': 'Info Desk', 'email': 'info@example.com', 'password': 'pw', 'repeated_password': 'pw',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(User.objects.get(pk=response.json()['user_id']).username, 'info_8')
+
+    def test_registration_retries_when_username_was_taken(self):
+        from user_auth_app.api.serializers import RegistrationSerializer
+        names = iter(['info', 'info_8'])
+        with mock.patch.object(RegistrationSerializer, 'generate_username_from_email', lambda self, email: next(names)):
+            serializer = RegistrationSerializer(data={
+                'fullname': 'Info Desk', 'email': 'info@example.com', 'password': 'pw', 'repeated_password': 'pw',
+            })
+            self.assertTrue(serializer.is_valid())
+            user = serializer.save()
+        self.assertEqual(user.username, 'info_8')
+
+
+class ImportUsersTests(TestCase):
+
+    def test_import(self):
+        User.objects.create_user('taken', 'Taken@example.com', 'pw')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write('email,fullname,password\n')
+            handle.write('info@a.example.com,Info A,secret\n')
+            handle.write('info@b.example.com,Info B,\n')
+            handle.write('INFO@a.example.com,Duplicate,\n')
+            handle.write('taken@example.com,Taken Again,\n')
+            handle.write('not-an-email,Broken,\n')
+            handle.write('taken@b.example.com,Ann Marie Lee,pw2\n')
+        self.addCleanup(os.remove, handle.name)
+
+        out = StringIO()
+        call_command('import_users', handle.name, '--batch-size', '2', stdout=out, stderr=StringIO())
+        self.assertIn('Created 3 user(s), skipped 3 row(s).', out.getvalue())
+
+        first = User.objects.get(email='info@a.example.com')
+        self.assertEqual((first.username, first.first_name, first.last_name), ('info', 'Info', 'A'))
+        self.assertTrue(first.check_password('secret'))
+        self.assertEqual(User.objects.get(email='info@b.example.com').username, 'info_1')
+        self.assertFalse(User.objects.get(email='info@b.example.com').has_usable_password())
+        other = User.objects.get(email='taken@b.example.com')
+        self.assertEqual((other.username, other.last_name), ('taken_1', 'Marie Lee'))
+
+
+class LoginTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'secret', first_name='Anna', last_name='Lee')
+
+    def count_hashes(self):
+        from django.contrib.auth import hashers
+        return mock.patch.object(hashers, 'pbkdf2', wraps=hashers.pbkdf2)
+
+    def test_password_is_hashed_once_per_attempt(self):
+        client = APIClient()
+        for email, password, code in [
+            ('ANNA@example.com', 'secret', 200),
+            ('anna@example.com', 'wrong', 400),
+            ('nobody@example.com', 'secret', 400),
+        ]:
+            with self.count_hashes() as pbkdf2:
+                response = client.post('/api/login/', {'email': email, 'password': password}, format='json')
+            self.assertEqual(response.status_code, code, email)
+            self.assertEqual(pbkdf2.call_count, 1, email)
+        self.assertEqual(response.json(), {'non_field_errors': ['Unable to log in with provided credentials.']})
+
+    def test_inactive_user_cannot_log_in(self):
+        self.user.is_active = False
+        self.user.save()
+        response = APIClient().post('/api/login/', {'email': 'anna@example.com', 'password': 'secret'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_async_login(self):
+        from django.test import AsyncClient
+        client = AsyncClient()
+        with self.count_hashes() as pbkdf2:
+            response = await client.post(
+                '/api/login/async/', {'email': 'anna@example.com', 'password': 'secret'}, content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(pbkdf2.call_count, 1)
+        body = response.json()
+        token = await Token.objects.aget(user_id=self.user.id)
+        self.assertEqual(body, {'token': token.key, 'user_id': self.user.id, 'email': 'anna@example.com', 'fullname': 'Anna Lee'})
+
+        with self.count_hashes() as pbkdf2:
+            response = await client.post(
+                '/api/login/async/', {'email': 'nobody@example.com', 'password': 'secret'}, content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(pbkdf2.call_count, 1)
+
+        response = await client.post('/api/login/async/', {'email': 'anna@example.com'}, content_type='application/json')
+        self.assertEqual(response.json(), {'password': ['This field is required.']})
+
+        for body in ('[1]', '"x"'):
+            response = await client.post('/api/login/async/', body, content_type='application/json')
+            self.assertEqual(response.status_code, 400, body)
@@ -0,0 +1,78 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+USERNAME_MAX_LENGTH = User._meta.get_field('username').max_length
+# Room left for the ``_<n>`` suffix of colliding usernames
+USERNAME_BASE_LENGTH = USERNAME_MAX_LENGTH - 11
+
+
+def users_with_email(email):
+    """Return users matching ``email`` case-insensitively.
+
+    The filter mirrors the expression and condition of the partial
+    ``auth_user_email_lower_uniq`` index so the lookup is an index search.
+    """
+    return User.objects.alias(email_lower=Lower('email')).filter(
+        email_lower=(email or '').lower(), email__gt=''
+    )
+
+
+def split_full_name(fullname):
+    """Split a full name into first name and the rest."""
+    parts = fullname.strip().split()
+    first = parts[0] if parts else ''
+    last = ' '.join(parts[1:])
+    return first, last
+
+
+def username_base(email):
+    """Return the username an email maps to before collisions are resolved."""
+    return email.split('@')[0][:USERNAME_BASE_LENGTH] or 'user'
+
+
+class UsernameAllocator:
+    """Hand out unique ``base`` / ``base_<n>`` usernames.
+
+    The taken names of each base are read once with an index range scan
+    over ``base`` and ``base_*``; later allocations for the same base are
+    answered from memory. Concurrent writers can still take a name first,
+    so callers retry on IntegrityError with a fresh allocator.
+    """
+
+    chunk_size = 200
+
+    def __init__(self):
+        self.base_free = {}
+        self.next_suffix = {}
+
+    def load(self, bases):
+        """Read the taken names of all bases not loaded yet."""
+        bases = sorted(set(bases) - set(self.next_suffix))
+        for start in range(0, len(bases), self.chunk_size):
+            chunk = bases[start:start + self.chunk_size]
+            # '`' is the character after '_', so this range holds every 'base_...' name.
+            ranges = reduce(or_, (
+                Q(username=base) | Q(username__gt=f'{base}_', username__lt=f'{base}`') for base in chunk
+            ))
+            taken = set(User.objects.filter(ranges).values_list('username', flat=True))
+            for base in chunk:
+                pattern = re.compile(rf'{re.escape(base)}_(\d+)')
+                suffixes = [int(match.group(1)) for name in taken if (match := pattern.fullmatch(name))]
+                self.base_free[base] = base not in taken
+                self.next_suffix[base] = max(suffixes, default=0) + 1
+
+    def allocate(self, email):
+        """Return an unused username for ``email``."""
+        base = username_base(email)
+        self.load([base])
+        if self.base_free[base]:
+            self.base_free[base] = False
+            return base
+        suffix = self.next_suffix[base]
+        self.next_suffix[base] = suffix + 1
+        return f'{base}_{suffix}'